@@ -0,0 +1,99 @@
+import hashlib
+import os
+import pickle
+import time
+import typing as t
+from pathlib import Path
+from types import ModuleType
+
+import bench
+import common
+
+ANSWERS_PATH = Path("data/cache/answers")
+
+Part = t.Literal["part1", "part2"]
+parts: tuple[Part, ...] = t.get_args(Part)
+
+
+def solution_key(m: ModuleType, year: int, day: int) -> str | None:
+    """Hash of everything a day's answers depend on: its own source, common, and its input.
+
+    None if the input doesn't exist, since there's nothing worth caching then.
+    """
+    input_path = Path(f"data/{year}/day{day:02}.txt")
+    if m.__file__ is None or not input_path.exists():
+        return None
+
+    h = hashlib.sha256()
+    for path in [Path(m.__file__), *sorted(Path(common.__file__).parent.glob("*.py")), input_path]:
+        h.update(hashlib.sha256(path.read_bytes()).digest())
+    return h.hexdigest()
+
+
+def load_answer(key: str, part: Part) -> tuple[t.Any, float] | None:
+    try:
+        with open(ANSWERS_PATH / f"{key}-{part}.pickle", "rb") as fp:
+            return pickle.load(fp)
+    except Exception:
+        # missing, or written by something incompatible. either way it needs to be run again
+        return None
+
+
+def save_answer(key: str, part: Part, answer: t.Any, elapsed: float):
+    ANSWERS_PATH.mkdir(parents=True, exist_ok=True)
+    tmp_path = ANSWERS_PATH / f"{key}-{part}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as fp:
+            pickle.dump((answer, elapsed), fp)
+    except Exception:
+        # not every answer has to be picklable, it just won't be cached
+        tmp_path.unlink(missing_ok=True)
+        return
+    os.replace(tmp_path, ANSWERS_PATH / f"{key}-{part}.pickle")
+
+
+def describe(part: Part, elapsed: float) -> str:
+    return f"({part} unchanged, using the answer from a run that took {bench.format_seconds(elapsed)})"
+
+
+def run_solution(m: ModuleType, year: int, day: int, force: bool = False) -> float:
+    """Run m.solution(), but serve any part whose source, common and input are unchanged from the cache.
+
+    If every part is cached the solution isn't run at all, so loading and parsing are skipped too.
+    force runs everything and refreshes the cache. Returns how long the parts served from the cache
+    took when they last really ran, so callers timing the run can account for them.
+    """
+    key = solution_key(m, year, day)
+    if key is None:
+        m.solution()
+        return 0
+
+    cached = {} if force else {part: hit for part in parts if (hit := load_answer(key, part)) is not None}
+    if len(cached) == len(parts):
+        for i, part in enumerate(parts, start=1):
+            answer, elapsed = cached[part]
+            print(describe(part, elapsed))
+            print(f"Part {i}: {answer}")
+        return sum(elapsed for _, elapsed in cached.values())
+
+    def wrap(phase: bench.Phase, fn: t.Callable) -> t.Callable:
+        if phase not in parts:
+            return fn
+        part = t.cast(Part, phase)
+
+        def memoized(*args, **kwargs):
+            if part in cached:
+                answer, elapsed = cached[part]
+                print(describe(part, elapsed))
+                return answer
+
+            start = time.perf_counter()
+            answer = fn(*args, **kwargs)
+            save_answer(key, part, answer, time.perf_counter() - start)
+            return answer
+
+        return memoized
+
+    with bench.instrumented(m, wrap):
+        m.solution()
+    return sum(elapsed for _, elapsed in cached.values())
@@ -1,46 +1,172 @@
+import argparse
 import datetime
 import importlib
 import sys
 import typing as t
 
-RunKind = t.Literal["run", "test"]
+import answers
+import bench
+import common
+import runner
+import serve
+
+RunKind = t.Literal["run", "test", "bench", "serve"]
 run_kinds = t.get_args(RunKind)
 
 
-def is_run_kind(val: str) -> t.TypeGuard[RunKind]:
-    return val in run_kinds
+def day_arg(val: str) -> int | t.Literal["all"]:
+    return "all" if val == "all" else int(val)
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc", usage="python -m aoc [run|test|bench|serve] <day|all> <year>")
+    parser.add_argument("kind", choices=run_kinds)
+    parser.add_argument("day", nargs="?", type=day_arg)
+    parser.add_argument("year", nargs="?", type=int)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="processes to use when running all days (default: one per cpu), or for a single day that can use them",
+    )
+    parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help=f"reuse parsed inputs pickled under {common.ParseCache.directory}",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"run every part even if its answer is cached under {answers.ANSWERS_PATH}",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=f"send the request to the server started with `python -m aoc serve` on {serve.SOCKET_PATH}",
+    )
+
+    timing = parser.add_argument_group("bench options")
+    timing.add_argument("--repeat", type=int, default=10, help="measured runs per phase (default: %(default)s)")
+    timing.add_argument("--warmup", type=int, default=1, help="unmeasured runs first (default: %(default)s)")
+    timing.add_argument(
+        "--entry",
+        choices=["solution", "test"],
+        default="solution",
+        help="time the real input or the examples in test() (default: %(default)s)",
+    )
+    timing.add_argument("--json", metavar="PATH", help="also write the results as JSON, - for stdout")
+
+    memory = parser.add_argument_group("memory options")
+    memory.add_argument(
+        "--memory",
+        action="store_true",
+        help="run each part once more under tracemalloc and report its peak and top allocation sites",
+    )
+    memory.add_argument(
+        "--memory-budget",
+        type=bench.parse_bytes,
+        metavar="SIZE",
+        help="fail if any part peaks above SIZE, like 64M or 1.5G (implies --memory)",
+    )
+    return parser
+
+
+def check_memory(usage: t.Mapping[bench.Phase, bench.MemoryUsage], budget: int | None) -> bool:
+    print(bench.format_memory_table(usage))
+    problems = bench.over_budget(usage, budget) if budget is not None else []
+    for problem in problems:
+        print(problem)
+    return not problems
+
+
+def wants_memory(args: argparse.Namespace) -> bool:
+    return args.memory or args.memory_budget is not None
+
+
+def run_bench(m, day: int, year: int, args: argparse.Namespace) -> bool:
+    stats = bench.bench(m, entry=args.entry, repeat=args.repeat, warmup=args.warmup)
+    print(bench.format_table(stats))
+
+    ok = True
+    usage = None
+    if wants_memory(args):
+        # measured separately, tracemalloc would throw the timings off
+        usage = bench.profile_memory(m, entry=args.entry)
+        print()
+        ok = check_memory(usage, args.memory_budget)
+
+    if args.json:
+        report = bench.to_json(
+            stats, usage, year=year, day=day, entry=args.entry, repeat=args.repeat, warmup=args.warmup
+        )
+        if args.json == "-":
+            print(report)
+        else:
+            with open(args.json, "w") as fp:
+                fp.write(report)
+    return ok
+
+
+def run_day(m, args: argparse.Namespace) -> bool:
+    """Returns False when the day ran but broke the memory budget."""
+    common.workers = args.workers
+    if args.kind == "bench":
+        return run_bench(m, args.day, args.year, args)
+
+    if wants_memory(args):
+        # the parts have to actually run to be measured, so cached answers don't apply
+        usage = bench.profile_memory(m, entry="test" if args.kind == "test" else "solution", quiet=False)
+        return check_memory(usage, args.memory_budget)
+
+    if args.kind == "test":
+        m.test()
+    else:
+        answers.run_solution(m, args.year, args.day, force=args.force)
+    return True
 
 
 def main():
-    try:
-        program_name, kind, *args = sys.argv
-        if not is_run_kind(kind):
-            raise ValueError(f"Invalid RunKind {kind}")
-    except ValueError:
-        print("usage: python -m aoc [run|test] <day> <year>")
-        sys.exit(1)
+    args = make_parser().parse_args()
+    kind: RunKind = args.kind
+
+    if kind == "serve":
+        serve.serve(lambda m, request: run_day(m, argparse.Namespace(**request)))
+        return
 
     now = datetime.datetime.now()
-    match args:
-        case [day, year]:
-            day = int(day)
-            year = int(year)
-        case [day]:
-            day = int(day)
-            year = now.year
-        case _:
-            day = now.day
-            year = now.year
+    day = args.day = args.day if args.day is not None else now.day
+    year = args.year = args.year if args.year is not None else now.year
+
+    if args.daemon:
+        if day == "all":
+            print("the server runs a single day at a time")
+            sys.exit(1)
+        if not serve.request(vars(args)):
+            sys.exit(1)
+        return
+
+    if day == "all":
+        if kind == "bench":
+            print("bench runs a single day at a time")
+            sys.exit(1)
+        if wants_memory(args):
+            print("memory is measured a single day at a time")
+            sys.exit(1)
+        if not runner.run_year(kind, year, workers=args.workers, parse_cache=args.parse_cache, force=args.force):
+            sys.exit(1)
+        return
 
     try:
         m = importlib.import_module(f"aoc{year}.day{day:02}")
-        print(f"Running AOC {year}, Day {day:02}")
-        if kind == "test":
-            m.test()
-        else:
-            m.solution()
     except ImportError:
         print(f"Unable to find AOC {year}, Day {day:02}")
+        return
+
+    if args.parse_cache:
+        common.parse_cache = common.ParseCache()
+
+    print(f"Running AOC {year}, Day {day:02}")
+    if not run_day(m, args):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
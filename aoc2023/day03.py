@@ -1,156 +1,99 @@
-import contextlib
+import bisect
+import itertools
+import re
 import typing as t
 from dataclasses import dataclass
-from dataclasses import field
 
 import common
 
-
-@dataclass(frozen=True)
-class Pos:
-    x: int
-    y: int
+TOKENS = re.compile(r"(\d+)|[^.\d]")
 
 
 @dataclass
-class Cell:
-    character: str
-    marked: bool = False
-    gathered: bool = False
-    number_id: int | None = None
-
+class Row(common.LineConsumer):
+    """One line of the schematic: its numbers as (start, end, value) spans, and where its symbols are."""
 
-@dataclass
-class Schematic(common.LineConsumer):
-    data: dict[Pos, Cell] = field(default_factory=dict)
+    numbers: list[tuple[int, int, int]]
+    symbols: list[int]
+    stars: list[int]
 
     @classmethod
     def from_lines(cls: type[t.Self], data_iter: t.Iterator[str]) -> t.Self:
-        s = cls()
-        row = 0
-        with contextlib.suppress(StopIteration):
-            while line := next(data_iter):
-                for col, char in enumerate(line):
-                    if char != ".":
-                        s.data[Pos(col, row)] = Cell(char)
-                row += 1
-
-        return s
-
-
-def monotonic():
-    i = 0
-    while True:
-        i += 1
-        yield i
-
-
-IDS = monotonic()
+        line = next(data_iter)
+        if not line:
+            raise StopIteration
 
+        row = cls([], [], [])
+        for match in TOKENS.finditer(line):
+            if match.group(1) is not None:
+                row.numbers.append((match.start(), match.end(), int(match.group())))
+            else:
+                row.symbols.append(match.start())
+                if match.group() == "*":
+                    row.stars.append(match.start())
+        return row
 
-def is_symbol(cell: Cell):
-    return not cell.character.isdigit()
+    def has_symbol(self, first: int, last: int) -> bool:
+        """Whether there's a symbol anywhere from column first to last, inclusive."""
+        i = bisect.bisect_left(self.symbols, first)
+        return i < len(self.symbols) and self.symbols[i] <= last
 
+    def numbers_touching(self, col: int) -> list[int]:
+        """Numbers with a digit in column col or either side of it."""
+        # spans don't overlap, so going left from the last one to start by col + 1, the ends only get smaller
+        i = bisect.bisect_right(self.numbers, col + 1, key=lambda n: n[0])
+        touching = []
+        while i > 0 and self.numbers[i - 1][1] >= col:
+            touching.append(self.numbers[i - 1][2])
+            i -= 1
+        return touching
 
-def is_star_symbol(cell: Cell):
-    return cell.character == "*"
 
+EMPTY_ROW = Row([], [], [])
 
-def neigbours(pos: Pos):
-    for i in range(-1, 2):
-        for j in range(-1, 2):
-            if i or j:
-                yield Pos(pos.x + i, pos.y + j)
 
+def window_sums(above: Row, row: Row, below: Row) -> tuple[int, int]:
+    """The part numbers and gear ratios belonging to row, which only depend on the rows either side."""
+    window = (above, row, below)
+    parts = sum(value for start, end, value in row.numbers if any(r.has_symbol(start - 1, end) for r in window))
 
-def gather_number(s: Schematic, p: Pos):
-    offset = -1
-    digits = []
-    marked = False
-    number_id = next(IDS)
-    while (gather := Pos(p.x + offset, p.y)) in s.data and not is_symbol(s.data[gather]):
-        cell = s.data[gather]
-        cell.gathered = True
-        cell.number_id = number_id
-        digits.insert(0, cell.character)
-        marked = marked or cell.marked
-        offset -= 1
+    ratios = 0
+    for col in row.stars:
+        adjacent = [value for r in window for value in r.numbers_touching(col)]
+        if len(adjacent) == 2:
+            ratios += adjacent[0] * adjacent[1]
 
-    offset = 0
-    while (gather := Pos(p.x + offset, p.y)) in s.data and not is_symbol(s.data[gather]):
-        cell = s.data[gather]
-        cell.gathered = True
-        cell.number_id = number_id
-        digits.append(cell.character)
-        marked = marked or cell.marked
-        offset += 1
+    return parts, ratios
 
-    return int("".join(digits)), marked
 
+def stream(rows: t.Iterable[Row]) -> t.Iterator[tuple[int, int]]:
+    """Part number and gear ratio sums for each row, as soon as the row below it has been read.
 
-def gather_marked_numbers(s: Schematic):
-    gathered: list[int] = []
-    for pos in s.data:
-        if s.data[pos].gathered or is_symbol(s.data[pos]):
-            continue
+    Only three rows are held at a time, so memory depends on how wide the schematic is, not how long.
+    """
+    above, row = EMPTY_ROW, None
+    for below in itertools.chain(rows, [EMPTY_ROW]):
+        if row is not None:
+            yield window_sums(above, row, below)
+            above = row
+        row = below
 
-        # it's a digit we haven't seen yet
-        num, marked = gather_number(s, pos)
-        if marked:
-            gathered.append(num)
 
-    return gathered
+def part1(rows: t.Iterable[Row]):
+    return sum(parts for parts, _ in stream(rows))
 
 
-def part1(s: Schematic):
-    for pos, cell in s.data.items():
-        if is_symbol(cell):
-            for neighbour in neigbours(pos):
-                if neighbour in s.data:
-                    s.data[neighbour].marked = True
-
-    return sum(gather_marked_numbers(s))
-
-
-def part2(s: Schematic):
-    ratios = []
-
-    # do a pass to generate ids
-    for pos, cell in s.data.items():
-        if is_symbol(cell) or cell.gathered:
-            continue
-        gather_number(s, pos)
-
-    # for pos, cell in s.data.items():
-    #     print(pos, cell)
-
-    for pos, cell in s.data.items():
-        if is_star_symbol(cell):
-            count = len({s.data[neighbour].number_id for neighbour in neigbours(pos) if neighbour in s.data})
-            is_gear = count == 2
-            # print(f"found * at {pos}: {is_gear}")
-            if is_gear:
-                ratio_parts = set()
-                for neighbour in neigbours(pos):
-                    if neighbour in s.data:
-                        # if s.data[neighbour].marked:
-                        #     raise Exception("Gear twice!")
-                        # s.data[neighbour].marked = True
-                        ratio_parts.add(gather_number(s, neighbour)[0])
-                part1 = ratio_parts.pop()
-                part2 = ratio_parts.pop() if ratio_parts else part1
-                ratios.append(part1 * part2)
-    return sum(ratios)
+def part2(rows: t.Iterable[Row]):
+    return sum(ratios for _, ratios in stream(rows))
 
 
 def solution():
-    raw_data = common.load("data/2023/day03.txt")
-    formatted_data = common.parse_all(raw_data, Schematic)
-
-    answer1 = part1(formatted_data)
+    with common.open_input("data/2023/day03.txt") as fp:
+        answer1 = part1(common.parse_iter(fp, Row))
     print(f"Part 1: {answer1}")
 
-    answer2 = part2(formatted_data)
+    with common.open_input("data/2023/day03.txt") as fp:
+        answer2 = part2(common.parse_iter(fp, Row))
     print(f"Part 2: {answer2}")
 
 
@@ -165,10 +108,10 @@ def test():
 ......755.
 ...$.*....
 .664.598.."""
-    answer1 = part1(common.parse_all(test1, Schematic))
+    answer1 = part1(common.parse_iter(test1, Row))
     print(f"Part 1: {answer1}")
     assert answer1 == 4361
 
-    answer2 = part2(common.parse_all(test1, Schematic))
+    answer2 = part2(common.parse_iter(test1, Row))
     print(f"Part 2: {answer2}")
     assert answer2 == 467835
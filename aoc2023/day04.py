@@ -1,3 +1,4 @@
+import collections
 import typing as t
 from dataclasses import dataclass
 
@@ -29,28 +30,34 @@ def value(card: ScratchCard):
     return 2 ** (winners - 1) if winners else 0
 
 
-def part1(data: list[ScratchCard]):
+def part1(data: t.Iterable[ScratchCard]):
     return sum(value(card) for card in data)
 
 
-def part2(data: list[ScratchCard]):
-    data_dict = {card.card_id: card for card in data}
-    for card_id, card in data_dict.items():
-        winners = matches(card)
-        for i in range(winners):
-            data_dict[card_id + i + 1].count += card.count
+def part2(data: t.Iterable[ScratchCard]):
+    # copies won by the cards seen so far, for the cards coming up next.
+    # a card only ever wins copies of the few cards right after it, so this stays short.
+    won: collections.deque[int] = collections.deque()
+    total = 0
+    for card in data:
+        count = card.count + (won.popleft() if won else 0)
+        total += count
+        for i in range(matches(card)):
+            if i < len(won):
+                won[i] += count
+            else:
+                won.append(count)
 
-    return sum(card.count for card in data)
+    return total
 
 
 def solution():
-    raw_data = common.load("data/2023/day04.txt")
-    formatted_data = common.parse(raw_data, ScratchCard)
-
-    answer1 = part1(formatted_data)
+    with common.open_input("data/2023/day04.txt") as fp:
+        answer1 = part1(common.parse_iter(fp, ScratchCard))
     print(f"Part 1: {answer1}")
 
-    answer2 = part2(formatted_data)
+    with common.open_input("data/2023/day04.txt") as fp:
+        answer2 = part2(common.parse_iter(fp, ScratchCard))
     print(f"Part 2: {answer2}")
 
 
@@ -61,11 +68,11 @@ Card 3:  1 21 53 59 44 | 69 82 63 72 16 21 14  1
 Card 4: 41 92 73 84 69 | 59 84 76 51 58  5 54 83
 Card 5: 87 83 26 28 32 | 88 30 70 12 93 22 82 36
 Card 6: 31 18 13 56 72 | 74 77 10 23 35 67 36 11"""
-    answer1 = part1(common.parse(test1, ScratchCard))
+    answer1 = part1(common.parse_iter(test1, ScratchCard))
     print(f"Part 1: {answer1}")
     assert answer1 == 13
 
     test2 = test1
-    answer2 = part2(common.parse(test2, ScratchCard))
+    answer2 = part2(common.parse_iter(test2, ScratchCard))
     print(f"Part 2: {answer2}")
     assert answer2 == 30
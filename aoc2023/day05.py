@@ -1,3 +1,5 @@
+import bisect
+import math
 import typing as t
 from dataclasses import dataclass
 import itertools
@@ -28,84 +30,103 @@ class Almanac(common.LineConsumer):
         return cls(source=s, destination=d, mappings=mapping_list)
 
 
-def find_dest(val: int, a: Almanac) -> int:
-    assert a.mappings is not None
-    for dest_start, src_start, count in a.mappings:
-        if val >= src_start and val < src_start + count:
-            offset = val - src_start
-            return dest_start + offset
-    return val
-
-
-def find_source(val: int, a: Almanac) -> int:
-    assert a.mappings is not None
-    for dest_start, src_start, count in a.mappings:
-        if val >= dest_start and val < dest_start + count:
-            offset = val - dest_start
-            return src_start + offset
-    return val
-
-
-def in_next(value: int, source: str, dest_by_source: dict[str, Almanac]):
-    dest = dest_by_source[source]
-    return find_dest(value, dest), dest.destination
-
+@dataclass
+class Piecewise:
+    """A function over the non-negative ints that adds offsets[i] to anything from starts[i] up to starts[i + 1]."""
 
-def in_prev(value: int, dest: str, source_by_dest: dict[str, Almanac]):
-    source = source_by_dest[dest]
-    assert source.source is not None
-    return find_source(value, source), source.source
+    starts: list[int]
+    offsets: list[int]
 
+    @classmethod
+    def build(cls, pieces: t.Iterable[tuple[int, int]]) -> t.Self:
+        """From (start, offset) pairs in order, dropping any breakpoint that doesn't change the offset."""
+        starts: list[int] = []
+        offsets: list[int] = []
+        for start, offset in pieces:
+            if starts and starts[-1] == start:
+                starts.pop()
+                offsets.pop()
+            if not offsets or offsets[-1] != offset:
+                starts.append(start)
+                offsets.append(offset)
+        return cls(starts, offsets)
 
-def find_location(dest_by_source: dict[str, Almanac], val: int):
+    @classmethod
+    def from_almanac(cls, a: Almanac) -> t.Self:
+        assert a.mappings is not None
+        pieces = [(0, 0)]
+        for dest_start, src_start, count in sorted(a.mappings, key=lambda m: m[1]):
+            pieces.append((src_start, dest_start - src_start))
+            pieces.append((src_start + count, 0))
+        return cls.build(pieces)
+
+    def __call__(self, val: int) -> int:
+        return val + self.offsets[bisect.bisect_right(self.starts, val) - 1]
+
+    def then(self, after: "Piecewise") -> "Piecewise":
+        """The function that applies this one and then after."""
+        pieces = []
+        ends = [*self.starts[1:], math.inf]
+        for start, end, offset in zip(self.starts, ends, self.offsets):
+            # this piece gets cut wherever its image crosses one of after's breakpoints
+            first = bisect.bisect_right(after.starts, start + offset)
+            last = bisect.bisect_left(after.starts, end + offset)
+            for cut in [start, *(b - offset for b in after.starts[first:last])]:
+                pieces.append((cut, offset + after.offsets[bisect.bisect_right(after.starts, cut + offset) - 1]))
+        return Piecewise.build(pieces)
+
+
+def compile_chain(almanacs: list[Almanac]) -> Piecewise:
+    """Compose every table from seed through to location into a single function."""
+    dest_by_source = {a.source: a for a in almanacs if a.source is not None}
+    compiled = Piecewise([0], [0])
     source = "seed"
     while source != "location":
-        # print(f"{source.capitalize()} {val}", end=", ")
-        val, source = in_next(val, source, dest_by_source)
-    # print(f"{source.capitalize()} {val}")
-    return val
+        almanac = dest_by_source[source]
+        compiled = compiled.then(Piecewise.from_almanac(almanac))
+        source = almanac.destination
+    return compiled
 
 
-def location_has_seed(source_by_dest: dict[str, Almanac], val: int):
-    dest = "location"
-    while dest != "seed":
-        val, dest = in_prev(val, dest, source_by_dest)
-    return val
-
-
-def get_locations(seeds: list[int], dest_by_source: dict[str, Almanac]):
-    for val in seeds:
-        yield find_location(dest_by_source, val)
-
-
-def has_seed(seeds: Almanac, seed):
-    assert seeds.seeds is not None
-    for start, count in itertools.batched(seeds.seeds, 2):
-        if seed >= start and seed < start + count:
-            return True
-    return False
+def split_ranges(ranges: list[tuple[int, int]], a: Almanac) -> list[tuple[int, int]]:
+    """Push half open [start, end) ranges through a's mappings, splitting them wherever a mapping begins or ends."""
+    assert a.mappings is not None
+    mapped = []
+    pending = ranges
+    for dest_start, src_start, count in a.mappings:
+        src_end = src_start + count
+        unmapped = []
+        for start, end in pending:
+            # whatever hangs off either side of this mapping might still be caught by another one
+            if start < src_start:
+                unmapped.append((start, min(end, src_start)))
+            if end > src_end:
+                unmapped.append((max(start, src_end), end))
+            low, high = max(start, src_start), min(end, src_end)
+            if low < high:
+                mapped.append((low - src_start + dest_start, high - src_start + dest_start))
+        pending = unmapped
+    return mapped + pending
 
 
 def part1(data: list[Almanac]):
     seeds, *mappings = data
-    dest_by_source = {m.source: m for m in mappings if m.source is not None}
     assert seeds.seeds is not None
-    return min(get_locations(seeds.seeds, dest_by_source))
+    location = compile_chain(mappings)
+    return min(location(seed) for seed in seeds.seeds)
 
 
 def part2(data: list[Almanac]):
     seeds, *mappings = data
-    source_by_dest = {m.destination: m for m in mappings if m.source is not None}
+    dest_by_source = {m.source: m for m in mappings if m.source is not None}
     assert seeds.seeds is not None
-    location = 0
-    bail_out = 993500720
-    while True:
-        possible_seed = location_has_seed(source_by_dest, location)
-        if has_seed(seeds, possible_seed):
-            return location
-        location += 1
-        if location > bail_out:
-            raise Exception("Something went wrong, because the first part had a seed here!")
+    ranges = [(start, start + count) for start, count in itertools.batched(seeds.seeds, 2)]
+    source = "seed"
+    while source != "location":
+        almanac = dest_by_source[source]
+        ranges = split_ranges(ranges, almanac)
+        source = almanac.destination
+    return min(start for start, _ in ranges)
 
 
 def solution():
@@ -1,3 +1,4 @@
+import math
 import typing as t
 from dataclasses import dataclass
 
@@ -28,20 +29,145 @@ class Node:
         raise Exception("Invalid direction!")
 
 
-def directions_iter(directions: str):
-    while True:
-        yield from directions
+@dataclass
+class Orbit:
+    """The steps at which one ghost stands on an end node.
 
+    Before prefix it's exactly the steps in early_hits. From prefix on the walk repeats every length
+    steps, and it's every step congruent to one of residues.
+    """
 
-def traverse(start: str, ends: set[str], dir_steps: str, nodes: dict[str, Node]) -> int:
-    location = start
-    directions = directions_iter(dir_steps)
-    steps = 0
-    while location not in ends:
-        steps += 1
-        location = nodes[location].get(next(directions))
+    prefix: int
+    length: int
+    early_hits: list[int]
+    residues: list[int]
 
-    return steps
+    def at_end(self, step: int) -> bool:
+        if step < self.prefix:
+            return step in self.early_hits
+        return step % self.length in self.residues
+
+
+@dataclass
+class Network:
+    """The map with names interned to ids, set up to move whole passes through the directions at a time.
+
+    jumps[k][node] is where a ghost starting a pass on node is 2**k passes later, and ends_within[k][node]
+    whether it stands on an end at any step along the way. end_offsets[node] are the steps into a pass
+    that land on an end when it starts on node.
+    """
+
+    names: list[str]
+    ids: dict[str, int]
+    dir_steps: str
+    by_direction: dict[str, list[int]]
+    end_offsets: list[list[int]]
+    jumps: list[list[int]]
+    ends_within: list[list[bool]]
+
+    @classmethod
+    def build(cls, dir_steps: str, nodes: dict[str, Node], ends: set[str]) -> t.Self:
+        names = list(nodes)
+        ids = {name: i for i, name in enumerate(names)}
+        by_direction = {d: [ids[nodes[name].get(d)] for name in names] for d in set(dir_steps)}
+        turns = [by_direction[d] for d in dir_steps]
+        is_end = [name in ends for name in names]
+
+        after_pass = []
+        end_offsets = []
+        for start in range(len(names)):
+            node = start
+            offsets = []
+            for offset, turn in enumerate(turns):
+                if is_end[node]:
+                    offsets.append(offset)
+                node = turn[node]
+            after_pass.append(node)
+            end_offsets.append(offsets)
+
+        network = cls(
+            names, ids, dir_steps, by_direction, end_offsets, [after_pass], [[bool(o) for o in end_offsets]]
+        )
+        # once a ghost has made as many passes as there are nodes, it's seen everything it ever will
+        while 1 << len(network.jumps) <= len(names):
+            network.add_level()
+        return network
+
+    def add_level(self):
+        jump, within = self.jumps[-1], self.ends_within[-1]
+        self.jumps.append([jump[jump[node]] for node in range(len(self.names))])
+        self.ends_within.append([within[node] or within[jump[node]] for node in range(len(self.names))])
+
+    def position(self, start: str, steps: int) -> str:
+        """Where a ghost starting on start is after steps."""
+        passes, remainder = divmod(steps, len(self.dir_steps))
+        while passes >> len(self.jumps):
+            self.add_level()
+
+        node = self.ids[start]
+        for k, jump in enumerate(self.jumps):
+            if passes >> k & 1:
+                node = jump[node]
+        for d in self.dir_steps[:remainder]:
+            node = self.by_direction[d][node]
+        return self.names[node]
+
+    def first_end(self, start: str) -> int | None:
+        """Steps until a ghost starting on start first stands on an end, None if it never does."""
+        node = self.ids[start]
+        passes = 0
+        for k in reversed(range(len(self.jumps))):
+            if not self.ends_within[k][node]:
+                node = self.jumps[k][node]
+                passes += 1 << k
+        if not self.end_offsets[node]:
+            return None
+        return passes * len(self.dir_steps) + self.end_offsets[node][0]
+
+    def find_orbit(self, start: str) -> Orbit:
+        # a walk can only repeat at a multiple of the pass length, so passes are all that need tracking
+        seen: dict[int, int] = {}
+        hits = []
+        node = self.ids[start]
+        passes = 0
+        while node not in seen:
+            seen[node] = passes
+            hits.extend(passes * len(self.dir_steps) + offset for offset in self.end_offsets[node])
+            node = self.jumps[0][node]
+            passes += 1
+
+        prefix = seen[node] * len(self.dir_steps)
+        length = (passes - seen[node]) * len(self.dir_steps)
+        return Orbit(
+            prefix,
+            length,
+            [h for h in hits if h < prefix],
+            [h % length for h in hits if h >= prefix],
+        )
+
+
+def first_common_step(orbits: list[Orbit]) -> int:
+    # anything before every ghost is looping has to be an early hit for one of them
+    for step in sorted({h for o in orbits for h in o.early_hits}):
+        if all(o.at_end(step) for o in orbits):
+            return step
+
+    # fold the ghosts in one at a time, keeping every residue that works for all of them so far
+    solutions, modulus = {0}, 1
+    for o in orbits:
+        merged = set()
+        for x in solutions:
+            for r in o.residues:
+                solved = common.numtheory.crt([(x, modulus), (r, o.length)])
+                if solved is not None:
+                    merged.add(solved[0])
+        solutions, modulus = merged, math.lcm(modulus, o.length)
+
+    if not solutions:
+        raise Exception("The ghosts are never all on an end at the same time!")
+
+    looping_from = max(o.prefix for o in orbits)
+    return min(x + (looping_from - x + modulus - 1) // modulus * modulus if x < looping_from else x for x in solutions)
 
 
 def part1(data: list[common.WholeLine]):
@@ -49,7 +175,13 @@ def part1(data: list[common.WholeLine]):
     nodes = [Node.make(line.data) for line in data[2:]]
     nodes = {n.name: n for n in nodes}
 
-    return traverse("AAA", {"ZZZ"}, dir_steps, nodes)
+    network = Network.build(dir_steps, nodes, {"ZZZ"})
+    steps = network.first_end("AAA")
+    if steps is None:
+        raise Exception("There's no way to ZZZ!")
+    if network.position("AAA", steps) != "ZZZ":
+        raise Exception(f"Walking {steps} steps from AAA doesn't land on ZZZ!")
+    return steps
 
 
 def part2(data: list[common.WholeLine]):
@@ -59,8 +191,8 @@ def part2(data: list[common.WholeLine]):
     ends = {n.name for n in nodes if n.name.endswith("Z")}
     nodes = {n.name: n for n in nodes}
 
-    factors = [traverse(s, ends, dir_steps, nodes) for s in starts]
-    return common.lcm(factors)
+    network = Network.build(dir_steps, nodes, ends)
+    return first_common_step([network.find_orbit(s) for s in starts])
 
 
 def solution():
@@ -98,6 +230,14 @@ ZZZ = (ZZZ, ZZZ)"""
     assert answer1 == 2
     assert answer2 == 6
 
+    # walking the passes one by one has to agree with jumping through them
+    lines = common.parse(test2, common.WholeLine)
+    nodes = [Node.make(line.data) for line in lines[2:]]
+    network = Network.build(lines[0].data, {n.name: n for n in nodes}, {"ZZZ"})
+    walked = ["AAA", "BBB", "AAA", "BBB", "AAA", "BBB", "ZZZ"]
+    assert [network.position("AAA", steps) for steps in range(len(walked))] == walked
+    assert network.position("AAA", 1_000_000) == "ZZZ"
+
     test3 = """LR
 
 11A = (11B, XXX)
@@ -111,3 +251,17 @@ XXX = (XXX, XXX)"""
     answer3 = part2(common.parse(test3, common.WholeLine))
     print(f"Part 2: {answer3}")
     assert answer3 == 6
+
+    # the first end each ghost reaches is at 2 and 1 steps, but neither starts looping from there
+    test4 = """L
+
+11A = (11B, 11B)
+11B = (11Z, 11Z)
+11Z = (11C, 11C)
+11C = (11B, 11B)
+22A = (22Z, 22Z)
+22Z = (22B, 22B)
+22B = (22Z, 22Z)"""
+    answer4 = part2(common.parse(test4, common.WholeLine))
+    print(f"Part 2: {answer4}")
+    assert answer4 == 5
@@ -1,232 +1,123 @@
 from __future__ import annotations
 
-import contextlib
-import enum
 import typing as t
+from array import array
 from dataclasses import dataclass
 
 import common
 
-
-class Compass(enum.StrEnum):
-    N = "NORTH"
-    S = "SOUTH"
-    E = "EAST"
-    W = "WEST"
-
-
-class PositionType(enum.StrEnum):
-    I = "IN"
-    O = "OUT"
-
-
-@dataclass(frozen=True)
-class Pos:
-    x: int
-    y: int
-
-    def __add__(self, other: Pos):
-        return Pos(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other: Pos):
-        return Pos(self.x - other.x, self.y - other.y)
-
+N, E, S, W = 1, 2, 4, 8
+OPPOSITE = {N: S, E: W, S: N, W: E}
 
 Shape = t.Literal["|", "-", "L", "J", "7", "F"]
 
-
-@dataclass(frozen=True)
-class Pipe:
-    shape: Shape
-    connections: frozenset[Compass]
-
-
-legend: dict[Shape, frozenset[Compass]] = {
-    "|": frozenset([Compass.N, Compass.S]),
-    "-": frozenset([Compass.E, Compass.W]),
-    "L": frozenset([Compass.N, Compass.E]),
-    "J": frozenset([Compass.N, Compass.W]),
-    "7": frozenset([Compass.S, Compass.W]),
-    "F": frozenset([Compass.S, Compass.E]),
+legend: dict[Shape, int] = {
+    "|": N | S,
+    "-": E | W,
+    "L": N | E,
+    "J": N | W,
+    "7": S | W,
+    "F": S | E,
 }
 
-unlegend: dict[frozenset[Compass], Shape] = {
-    frozenset([Compass.N, Compass.S]): "|",
-    frozenset([Compass.E, Compass.W]): "-",
-    frozenset([Compass.N, Compass.E]): "L",
-    frozenset([Compass.N, Compass.W]): "J",
-    frozenset([Compass.S, Compass.W]): "7",
-    frozenset([Compass.S, Compass.E]): "F",
-}
-
-
-def nav_dir(pos: Pos, dir: Compass) -> Pos:
-    match dir:
-        case Compass.N:
-            return Pos(pos.x, pos.y - 1)
-        case Compass.S:
-            return Pos(pos.x, pos.y + 1)
-        case Compass.E:
-            return Pos(pos.x + 1, pos.y)
-        case Compass.W:
-            return Pos(pos.x - 1, pos.y)
 
-    t.assert_never(dir)
-
-
-def get_from_dir(from_: Pos, to_: Pos) -> Compass:
-    """Return the direction you would have come from to go to to_ from from_"""
-    v = to_ - from_
-    match v.x, v.y:
-        case 1, 0:
-            return Compass.W
-        case -1, 0:
-            return Compass.E
-        case 0, 1:
-            return Compass.N
-        case 0, -1:
-            return Compass.S
-        case _:
-            raise ValueError("Positions must be one unit apart")
-
-
-def nav_pipe(pos: Pos, pipe: Pipe, came_from: Compass):
-    d = set(pipe.connections) - {came_from}
-    return nav_dir(pos, d.pop())
-
-
-def opposite(dir: Compass) -> Compass:
-    match dir:
-        case Compass.N:
-            return Compass.S
-        case Compass.S:
-            return Compass.N
-        case Compass.E:
-            return Compass.W
-        case Compass.W:
-            return Compass.E
-
-    t.assert_never(dir)
-
-
-def connected(p1: Pipe, p2: Pipe) -> bool:
-    return not p1.connections.isdisjoint(p2.connections)
-
-
-def start_neighbours(start_pos: Pos, map: dict[Pos, Pipe]) -> tuple[Pos, Pos, Shape]:
-    """Return the positions of the 2 connected neighbours for the starting position"""
-    neighbours = []
-    neighbour_dir = []
-    for dir in Compass:
-        with contextlib.suppress(KeyError):
-            if opposite(dir) in map[(n := nav_dir(start_pos, dir))].connections:
-                neighbours.append(n)
-                neighbour_dir.append(dir)
-
-    n1, n2 = neighbours
-    d1, d2 = neighbour_dir
-    s = unlegend[frozenset([d1, d2])]
-    return n1, n2, s
-
-
-def map_from(data: list[common.WholeLine]) -> tuple[Pos, dict[Pos, Pipe]]:
-    """Return starting position and map of pipes."""
-    map: dict[Pos, Pipe] = {}
-    start = Pos(-1, -1)
-    for j, line in enumerate(data):
-        for i, char in enumerate(line.data):
-            if char in legend:
-                map[Pos(i, j)] = Pipe(char, legend[char])
-            if char == "S":
-                start = Pos(i, j)
-
-    return start, map
-
-
-def get_loop(start, map, a, b):
-    visited = {start, a, b}
-
-    from_a, to_a = start, a
-    from_b, to_b = start, b
-
-    done = False
-    while not done:
-        next_a = nav_pipe(to_a, map[to_a], get_from_dir(from_a, to_a))
-        next_b = nav_pipe(to_b, map[to_b], get_from_dir(from_b, to_b))
-
-        done = next_a in visited or next_b in visited
-
-        visited.add(next_a)
-        visited.add(next_b)
-
-        from_a, to_a = to_a, next_a
-        from_b, to_b = to_b, next_b
-    return visited
-
-
-def get_extents(points: list[Pos]) -> tuple[int, int, int, int]:
-    min_x = min(p.x for p in points)
-    min_y = min(p.y for p in points)
-    max_x = max(p.x for p in points)
-    max_y = max(p.y for p in points)
-    return min_x, min_y, max_x, max_y
-
-
-def scan(extents: tuple[int, int, int, int], map: dict[Pos, Pipe]):
-    switch = {
-        PositionType.O: PositionType.I,
-        PositionType.I: PositionType.O,
-    }
-    min_x, min_y, max_x, max_y = extents
-
-    for j in range(min_y, max_y + 1):
-        on_edge = None
-        state = PositionType.O
-        for i in range(min_x - 1, max_x + 2):
-            pipe = map.get(Pos(i, j))
-            if on_edge:
-                if pipe is None:
-                    raise Exception(f"Discontinuous Pipe ({i}, {j})???")
-
-                if pipe.shape in {"7", "J"}:
-                    if (on_edge == "L" and pipe.shape == "7") or (on_edge == "F" and pipe.shape == "J"):
-                        state = switch[state]
-                    on_edge = None
-
-                continue
-
-            if pipe and pipe.shape == "|":
-                state = switch[state]
-            if pipe and pipe.shape in {"L", "F"}:
-                on_edge = pipe.shape
-                continue
-
-            if pipe is None:
-                # print(f"[{i}, {j}]: State is {state}")
-                yield state
+@dataclass
+class PipeMap:
+    """Which ways each tile's pipe connects, as N/E/S/W bits in a flat table indexed by y * width + x.
+
+    The start tile gets the connections of whatever pipe it's hiding.
+    """
+
+    width: int
+    height: int
+    connections: bytearray
+    start: int
+
+    @classmethod
+    def from_data(cls, data: list[common.WholeLine]) -> PipeMap:
+        width, height = len(data[0].data), len(data)
+        connections = bytearray(width * height)
+        start = -1
+        for y, line in enumerate(data):
+            for x, char in enumerate(line.data):
+                connections[y * width + x] = legend.get(t.cast(Shape, char), 0)
+                if char == "S":
+                    start = y * width + x
+
+        pipes = cls(width, height, connections, start)
+        # more than two neighbours can point at the start, so only keep a pair that makes a loop
+        candidates = [direction for direction in (N, E, S, W) if pipes.neighbour(start, direction) >= 0]
+        shapes = [
+            first | second
+            for i, first in enumerate(candidates)
+            for second in candidates[i + 1 :]
+            if pipes.leads_back(first) == second
+        ]
+        if len(shapes) != 1:
+            raise ValueError(f"Expected one loop through the start, found {len(shapes)}")
+        connections[start] = shapes[0]
+        return pipes
+
+    def neighbour(self, pos: int, direction: int) -> int:
+        """The tile next to pos in direction if it's on the grid and its pipe points back at pos, else -1.
+        The start always counts as pointing back."""
+        y, x = divmod(pos, self.width)
+        if not {N: y > 0, E: x < self.width - 1, S: y < self.height - 1, W: x > 0}[direction]:
+            return -1
+        pos += self.step(direction)
+        if pos == self.start or self.connections[pos] & OPPOSITE[direction]:
+            return pos
+        return -1
+
+    def leads_back(self, heading: int) -> int:
+        """Follow the pipes leaving the start towards heading. The direction they come back into the
+        start from, or 0 if they run into a dead end first."""
+        pos = self.neighbour(self.start, heading)
+        while pos >= 0:
+            if pos == self.start:
+                return OPPOSITE[heading]
+            heading = self.connections[pos] ^ OPPOSITE[heading]
+            pos = self.neighbour(pos, heading)
+        return 0
+
+    def step(self, direction: int) -> int:
+        return {N: -self.width, E: 1, S: self.width, W: -1}[direction]
+
+    def get_loop(self) -> array:
+        """Index of every tile on the loop, in the order it's walked from the start."""
+        steps = [0] * (W + 1)
+        back = [0] * (W + 1)
+        for direction in (N, E, S, W):
+            steps[direction] = self.step(direction)
+            back[direction] = OPPOSITE[direction]
+
+        connections = self.connections
+        heading = connections[self.start] & -connections[self.start]
+        loop = array("l", [self.start])
+        pos = self.start + steps[heading]
+        while pos != self.start:
+            loop.append(pos)
+            heading = connections[pos] ^ back[heading]
+            pos += steps[heading]
+        return loop
+
+
+def enclosed(loop: array, width: int) -> int:
+    """How many whole tiles are inside the loop, without looking at any of them."""
+    # shoelace for the area of the polygon through the tile centres, then pick's theorem backs out the
+    # points strictly inside it given the ones on the boundary
+    ys, xs = zip(*(divmod(pos, width) for pos in loop))
+    twice_area = abs(sum(xs[i - 1] * ys[i] - xs[i] * ys[i - 1] for i in range(len(loop))))
+    return (twice_area - len(loop)) // 2 + 1
 
 
 def part1(data: list[common.WholeLine]):
-    start, map = map_from(data)
-    a, b, start_shape = start_neighbours(start, map)
-    visited = get_loop(start, map, a, b)
-    return int(len(visited) / 2)
+    return len(PipeMap.from_data(data).get_loop()) // 2
 
 
 def part2(data: list[common.WholeLine]):
-    start, map = map_from(data)
-    a, b, start_shape = start_neighbours(start, map)
-    visited = get_loop(start, map, a, b)
-    map[start] = Pipe(start_shape, legend[start_shape])
-    extents = get_extents(list(visited))
-    loop_only_map = {pos: map[pos] for pos in visited}
-
-    count = 0
-    for t in scan(extents, loop_only_map):
-        if t == PositionType.I:
-            count += 1
-
-    return count
+    pipes = PipeMap.from_data(data)
+    return enclosed(pipes.get_loop(), pipes.width)
 
 
 def solution():
@@ -291,3 +182,18 @@ L--J.L7...LJS7F-7L7.
 
     assert answer21 == 4
     assert answer22 == 8
+
+    # three pipes point at S, but only two of them make the loop
+    test5 = """.|...
+.S-7.
+.|.|.
+.L-J.
+....."""
+
+    answer15 = part1(common.parse(test5, common.WholeLine))
+    answer25 = part2(common.parse(test5, common.WholeLine))
+    print(f"Part 1 [3]: {answer15}")
+    print(f"Part 2 [3]: {answer25}")
+
+    assert answer15 == 4
+    assert answer25 == 1
@@ -1,18 +1,10 @@
 from __future__ import annotations
 
-import itertools
-from dataclasses import dataclass
+import typing as t
 
 import common
 
-
-@dataclass(frozen=True)
-class Pos:
-    x: int
-    y: int
-
-    def __add__(self, other: Pos):
-        return Pos(self.x + other.x, self.y + other.y)
+Pos = common.Coordinate
 
 
 def make_map(data: list[common.WholeLine]):
@@ -24,49 +16,48 @@ def make_map(data: list[common.WholeLine]):
     return m
 
 
-def get_extents(m: set[Pos]):
-    min_x = min(p.x for p in m)
-    min_y = min(p.y for p in m)
-    max_x = max(p.x for p in m)
-    max_y = max(p.y for p in m)
-    return min_x, min_y, max_x, max_y
+def empties_before(coords: list[int]) -> list[int]:
+    """For each coordinate, how many lines without a galaxy come before it along that axis."""
+    occupied = sorted(set(coords))
+    rank = {val: i for i, val in enumerate(occupied)}
+    return [val - occupied[0] - rank[val] for val in coords]
 
 
-def expand(m: set[Pos], expansion=2):
-    min_x, min_y, max_x, max_y = get_extents(m)
-    sx = set(range(min_x, max_x + 1))
-    sy = set(range(min_y, max_y + 1))
-    for p in m:
-        sx.discard(p.x)
-        sy.discard(p.y)
+def axis_distance_sum(values: t.Iterable[int]) -> int:
+    """Sum of |a - b| over every pair of values.
 
-    for i in reversed(sorted(sx)):
-        m0 = {Pos(p.x, p.y) if p.x < i else Pos(p.x + expansion - 1, p.y) for p in m}
-        m = m0
+    Once they're sorted each value is the larger one of the pair with everything before it, so it adds
+    itself that many times less the running total of what came before.
+    """
+    total = seen = 0
+    for i, val in enumerate(sorted(values)):
+        total += val * i - seen
+        seen += val
+    return total
 
-    for j in reversed(sorted(sy)):
-        m0 = {Pos(p.x, p.y) if p.y < j else Pos(p.x, p.y + expansion - 1) for p in m}
-        m = m0
 
-    return m
+def distance_sums(m: set[Pos], factors: t.Sequence[int]) -> list[int]:
+    """Sum of the manhattan distances between every pair of galaxies, once the universe has expanded
+    by each of factors.
 
-
-def manhattan_distance(p1: Pos, p2: Pos):
-    x1, x2 = sorted([p1.x, p2.x])
-    y1, y2 = sorted([p1.y, p2.y])
-    return (x2 - x1) + (y2 - y1)
+    An expanded coordinate is x + (factor - 1) * empties_before(x), and both parts keep the galaxies in
+    the same order, so each axis's sum splits into the same two sums for every factor.
+    """
+    base = extra = 0
+    for coords in ([p.x for p in m], [p.y for p in m]):
+        base += axis_distance_sum(coords)
+        extra += axis_distance_sum(empties_before(coords))
+    return [base + (factor - 1) * extra for factor in factors]
 
 
 def part1(data: list[common.WholeLine]):
     m = make_map(data)
-    m = expand(m)
-    return sum(manhattan_distance(p1, p2) for p1, p2 in itertools.combinations(m, 2))
+    return distance_sums(m, [2])[0]
 
 
 def part2(data: list[common.WholeLine], expansion: int = 1_000_000):
     m = make_map(data)
-    m = expand(m, expansion=expansion)
-    return sum(manhattan_distance(p1, p2) for p1, p2 in itertools.combinations(m, 2))
+    return distance_sums(m, [expansion])[0]
 
 
 def solution():
@@ -105,3 +96,5 @@ def test():
 
     assert answer21 == 1030
     assert answer22 == 8410
+
+    assert distance_sums(make_map(common.parse(test1, common.WholeLine)), [2, 10, 100]) == [374, 1030, 8410]
@@ -1,9 +1,16 @@
-import itertools
+import functools
 import typing as t
 from dataclasses import dataclass
 
 import common
 
+BITS = str.maketrans("#.", "10")
+
+
+def encode(line: t.Iterable[str]) -> int:
+    """A row or column as an int, with a bit set for each #."""
+    return int("".join(line).translate(BITS), 2)
+
 
 @dataclass
 class Pattern(common.LineConsumer):
@@ -17,58 +24,34 @@ class Pattern(common.LineConsumer):
 
         return cls(lines)
 
-    @property
-    def transposed(self):
-        return ["".join(c) for c in zip(*self.data)]
-
+    @functools.cached_property
+    def rows(self) -> list[int]:
+        return [encode(line) for line in self.data]
 
-def print_side_by_side(l1: list[str], l2: list[str]):
-    for i, j in itertools.zip_longest(l1, l2):
-        print(f"{i or '': <20}   {j or '': <20}")
-    print()
+    @functools.cached_property
+    def columns(self) -> list[int]:
+        return [encode(column) for column in zip(*self.data)]
 
 
-def find_reflection(pattern: list[str]):
-    from_stack = list(pattern)  # don't mess with the original list
-    to_stack: list[str] = []
-    seam = 0
+def find_reflection(lines: list[int]):
+    for seam in range(1, len(lines)):
+        if all(lines[seam - 1 - i] == lines[seam + i] for i in range(min(seam, len(lines) - seam))):
+            return seam
 
-    while from_stack:
-        seam += 1
-        to_stack.insert(0, from_stack.pop(0))
-        # print_side_by_side(from_stack, to_stack)
-        if all(a == b for a, b in zip(from_stack, to_stack)):
-            break
-
-    if seam != len(pattern):
-        # print(f"Seam at {seam}")
-        return seam
-
-    # print("No seam")
     return False
 
 
-def find_smudgy_reflection(pattern: list[str]):
-    from_stack = list(pattern)  # don't mess with the original list
-    to_stack: list[str] = []
-    seam = 0
-
-    while from_stack:
-        seam += 1
-        to_stack.insert(0, from_stack.pop(0))
-        # print_side_by_side(from_stack, to_stack)
-        # any one row has exactly 1 difference
-        diffs: list[int] = []
-        for a, b in zip(from_stack, to_stack):
-            diffs.append(sum(c1 != c2 for c1, c2 in zip(a, b)))
-        if sum(diffs) == 1:
-            break
-
-    if seam != len(pattern):
-        # print(f"Seam at {seam}")
-        return seam
+def find_smudgy_reflection(lines: list[int]):
+    for seam in range(1, len(lines)):
+        # exactly one cell out across the whole fold, so give up on a seam as soon as it's two
+        diffs = 0
+        for i in range(min(seam, len(lines) - seam)):
+            diffs += (lines[seam - 1 - i] ^ lines[seam + i]).bit_count()
+            if diffs > 1:
+                break
+        if diffs == 1:
+            return seam
 
-    # print("No seam")
     return False
 
 
@@ -77,9 +60,9 @@ def part1(data: list[Pattern]):
     verticals: list[int] = []
 
     for d in data:
-        if (seam := find_reflection(d.data)) is not False:
+        if (seam := find_reflection(d.rows)) is not False:
             horizontals.append(seam)
-        elif (seam := find_reflection(d.transposed)) is not False:
+        elif (seam := find_reflection(d.columns)) is not False:
             verticals.append(seam)
 
     # print(horizontals, verticals)
@@ -91,9 +74,9 @@ def part2(data: list[Pattern]):
     verticals: list[int] = []
 
     for d in data:
-        if (seam := find_smudgy_reflection(d.data)) is not False:
+        if (seam := find_smudgy_reflection(d.rows)) is not False:
             horizontals.append(seam)
-        elif (seam := find_smudgy_reflection(d.transposed)) is not False:
+        elif (seam := find_smudgy_reflection(d.columns)) is not False:
             verticals.append(seam)
 
     # print(horizontals, verticals)
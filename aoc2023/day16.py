@@ -2,21 +2,12 @@ from __future__ import annotations
 
 import enum
 import typing as t
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 
 import common
 
-
-@dataclass(frozen=True)
-class Pos:
-    x: int
-    y: int
-
-    def __add__(self, other: Pos):
-        return Pos(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other: Pos):
-        return Pos(self.x - other.x, self.y - other.y)
+Pos = common.Coordinate
 
 
 class Direction(enum.StrEnum):
@@ -117,10 +108,11 @@ def make_sparse_map(data: list[common.WholeLine]) -> dict[Pos, Mirror]:
     return sparse
 
 
-def show_energized(e: set[Pos], width: int, height: int):
+def show_energized(cells: int, width: int, height: int):
+    """cells is a bitset as from BeamGraph.lit, with bit y * width + x set for each lit cell."""
     for j in range(height):
         for i in range(width):
-            if Pos(i, j) in e:
+            if cells >> (j * width + i) & 1:
                 print("#", end="")
             else:
                 print(".", end="")
@@ -128,76 +120,160 @@ def show_energized(e: set[Pos], width: int, height: int):
     print()
 
 
-def get_energized(
-    mirrors: dict[Pos, Mirror],
-    width: int,
-    height: int,
-    final_display: bool = False,
-    spos: Pos = Pos(0, 0),
-    sdir: Direction = Direction.EAST,
-):
-    unresolved: list[tuple[Pos, Direction]] = [(spos, sdir)]
-    visited: dict[Direction, set[Pos]] = {
-        Direction.EAST: set(),
-        Direction.WEST: set(),
-        Direction.NORTH: set(),
-        Direction.SOUTH: set(),
-    }
-
-    # step = 0
-    # bailout = 1_000
-    while unresolved:
-        # step += 1
-        # if step > bailout:
-        #     print("Woops! Bailing out")
-        #     break
-        pos, heading = unresolved.pop()
-        visited[heading].add(pos)
-
-        cur_mirror = mirrors.get(pos, Mirror.NONE)
-        result = traverse(cur_mirror, heading)
-        # print(f"Traversing {pos} going {heading} => {result}")
-        for dir in result:
-            travel = DIR_TO_VECTOR[dir]
-            next_pos = pos + travel
-            is_in_grid = next_pos.x >= 0 and next_pos.x < width and next_pos.y >= 0 and next_pos.y < height
-            if not is_in_grid:
-                # print(f"X: Throwing away {next_pos} - out of bounds")
+Beam = tuple[Pos, Direction]
+
+
+def walk(mirrors: dict[Pos, Mirror], width: int, height: int, pos: Pos, heading: Direction) -> tuple[int, list[Beam]]:
+    """Follow a beam from pos (inclusive) to the first mirror it meets, or off the grid.
+
+    Returns the cells crossed as a bitset with bit y * width + x set for each, including the mirror,
+    and the beams that leave that mirror.
+    """
+    travel = DIR_TO_VECTOR[heading]
+    cells = 0
+    while 0 <= pos.x < width and 0 <= pos.y < height:
+        cells |= 1 << (pos.y * width + pos.x)
+        if pos in mirrors:
+            return cells, [(pos, out) for out in traverse(mirrors[pos], heading)]
+        pos += travel
+    return cells, []
+
+
+@dataclass
+class BeamGraph:
+    """Every beam that can leave a mirror, with everything it goes on to energize worked out up front.
+
+    reach[(mirror, direction)] is the bitset of cells lit by a beam leaving that mirror in that direction,
+    including everything it splits or bounces into. Beams that loop back on each other all light the same
+    cells, so reach is found once per strongly connected component, sinks first.
+    """
+
+    mirrors: dict[Pos, Mirror]
+    width: int
+    height: int
+    reach: dict[Beam, int]
+
+    @classmethod
+    def build(cls, mirrors: dict[Pos, Mirror], width: int, height: int) -> BeamGraph:
+        segments: dict[Beam, int] = {}
+        successors: dict[Beam, list[Beam]] = {}
+        for pos, mirror in mirrors.items():
+            for heading in Direction:
+                for beam in traverse(mirror, heading):
+                    if (pos, beam) not in segments:
+                        segments[pos, beam], successors[pos, beam] = walk(
+                            mirrors, width, height, pos + DIR_TO_VECTOR[beam], beam
+                        )
+
+        # tarjan's, with an explicit stack since the beams can chain further than the recursion limit
+        reach: dict[Beam, int] = {}
+        index: dict[Beam, int] = {}
+        low: dict[Beam, int] = {}
+        stack: list[Beam] = []
+        on_stack: set[Beam] = set()
+        for root in segments:
+            if root in index:
                 continue
-            if next_pos in visited[dir]:
-                # print(f"X: Throwing away {next_pos} - already travelled {dir} there")
-                continue
-            # print(f"-> Adding {next_pos}, {dir} to outstanding")
-            unresolved.append((pos + travel, dir))
-
-    energized: set[Pos] = set()
-    for v in visited.values():
-        energized = energized.union(v)
-
-    if final_display:
-        show_energized(energized, width, height)
-    return len(energized)
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(successors[root]))]
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = low[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(successors[child])))
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        # every other component this one leads to is already done
+                        cells = 0
+                        for member in component:
+                            cells |= segments[member]
+                            for child in successors[member]:
+                                cells |= reach.get(child, 0)
+                        for member in component:
+                            reach[member] = cells
+
+        return cls(mirrors, width, height, reach)
+
+    def lit(self, spos: Pos, sdir: Direction) -> int:
+        """The bitset of cells lit by a beam entering at spos heading sdir."""
+        cells, beams = walk(self.mirrors, self.width, self.height, spos, sdir)
+        for beam in beams:
+            cells |= self.reach[beam]
+        return cells
+
+    def energized(self, spos: Pos, sdir: Direction) -> int:
+        """How many cells are lit by a beam entering at spos heading sdir."""
+        return self.lit(spos, sdir).bit_count()
 
 
 def part1(data: list[common.WholeLine]):
     mirrors = make_sparse_map(data)
     width = len(data[0].data)
     height = len(data)
-    return get_energized(mirrors, width, height, final_display=True)
+    cells = BeamGraph.build(mirrors, width, height).lit(Pos(0, 0), Direction.EAST)
+    show_energized(cells, width, height)
+    return cells.bit_count()
+
+
+def entries(width: int, height: int) -> list[Beam]:
+    """Every way a beam can come in from the edge."""
+    starts: list[Beam] = []
+    for start in range(0, width):
+        starts.append((Pos(start, 0), Direction.SOUTH))
+        starts.append((Pos(start, height - 1), Direction.NORTH))
+    for start in range(0, height):
+        starts.append((Pos(0, start), Direction.EAST))
+        starts.append((Pos(width - 1, start), Direction.WEST))
+    return starts
+
 
+# set once per worker process, so the graph is only sent over when the pool starts
+_worker_graph: BeamGraph | None = None
 
-def part2(data: list[common.WholeLine]):
+
+def _share_graph(graph: BeamGraph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _energized_in_worker(start: Beam) -> int:
+    assert _worker_graph is not None
+    spos, sdir = start
+    return _worker_graph.energized(spos, sdir)
+
+
+def part2(data: list[common.WholeLine], workers: int | None = None):
+    """With workers, the entries are split across a process pool once the BeamGraph is built."""
     mirrors = make_sparse_map(data)
     width = len(data[0].data)
     height = len(data)
-    acc = 0
-    for start in range(0, width):
-        acc = max(acc, get_energized(mirrors, width, height, spos=Pos(start, 0), sdir=Direction.SOUTH))
-        acc = max(acc, get_energized(mirrors, width, height, spos=Pos(start, height - 1), sdir=Direction.NORTH))
-    for start in range(0, height):
-        acc = max(acc, get_energized(mirrors, width, height, spos=Pos(0, start), sdir=Direction.EAST))
-        acc = max(acc, get_energized(mirrors, width, height, spos=Pos(width - 1, start), sdir=Direction.WEST))
-    return acc
+    starts = entries(width, height)
+    graph = BeamGraph.build(mirrors, width, height)
+
+    if workers is None:
+        return max(graph.energized(spos, sdir) for spos, sdir in starts)
+
+    with ProcessPoolExecutor(workers, initializer=_share_graph, initargs=(graph,)) as pool:
+        return max(pool.map(_energized_in_worker, starts, chunksize=max(len(starts) // (workers * 4), 1)))
 
 
 def solution():
@@ -207,7 +283,7 @@ def solution():
     answer1 = part1(formatted_data)
     print(f"Part 1: {answer1}")
 
-    answer2 = part2(formatted_data)
+    answer2 = part2(formatted_data, workers=common.workers)
     print(f"Part 2: {answer2}")
 
 
@@ -230,3 +306,7 @@ def test():
     answer2 = part2(common.parse(test2, common.WholeLine))
     print(f"Part 2: {answer2}")
     assert answer2 == 51
+
+    answer3 = part2(common.parse(test2, common.WholeLine), workers=2)
+    print(f"Part 2: {answer3}")
+    assert answer3 == 51
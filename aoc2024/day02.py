@@ -94,26 +94,20 @@ def is_valid(report: t.Sequence[int], dampener=False) -> bool:
 
 
 def part1(reports: t.Iterable[Report]):
-    valid = [r for r in reports if r.direction != 0 and r.max_delta <= 3]
-    return len(valid)
+    return sum(1 for r in reports if r.direction != 0 and r.max_delta <= 3)
 
 
 def part2(reports: t.Iterable[Report]):
-    valid = [r for r in reports if is_valid(r.levels)]
-    return len(valid)
+    return sum(1 for r in reports if is_valid(r.levels))
 
 
 def solution():
-    raw_data = common.load("data/2024/day02.txt")
-    # See also `common.pares_all` for more complicated inputs
-    formatted_data = common.parse(raw_data, Report)
-
-    answer1 = part1(formatted_data)
+    with common.open_input("data/2024/day02.txt") as fp:
+        answer1 = part1(common.parse_iter(fp, Report))
     print(f"Part 1: {answer1}")
 
-    formatted_data = common.parse(raw_data, Report)
-
-    answer2 = part2(formatted_data)
+    with common.open_input("data/2024/day02.txt") as fp:
+        answer2 = part2(common.parse_iter(fp, Report))
     print(f"Part 2: {answer2}")
 
 
@@ -125,11 +119,11 @@ def test():
 8 6 4 4 1
 1 3 6 7 9
 """
-    answer1 = part1(common.parse(test1, Report))
+    answer1 = part1(common.parse_iter(test1, Report))
     print(f"Part 1: {answer1}")
     # assert answer1 == ???
 
     test2 = test1
-    answer2 = part2(common.parse(test2, Report))
+    answer2 = part2(common.parse_iter(test2, Report))
     print(f"Part 2: {answer2}")
     # assert answer2 == ???
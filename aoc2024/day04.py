@@ -3,109 +3,43 @@ from __future__ import annotations
 import contextlib
 import typing as t
 from dataclasses import dataclass
-from dataclasses import field
 
 import common
 
 
-@dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
+def diagonals(grid: common.Grid):
+    ne, se, sw, nw = grid.offset(1, -1), grid.offset(1, 1), grid.offset(-1, 1), grid.offset(-1, -1)
+    yield se, ne
+    yield ne, nw
+    yield nw, sw
+    yield sw, se
 
-    def __add__(self, other: Coordinate):
-        return Coordinate(self.x + other.x, self.y + other.y)
 
-    def __mul__(self, other: int):
-        return Coordinate(self.x * other, self.y * other)
-
-
-@dataclass
-class Cell:
-    value: str
-
-
-@dataclass
-class Grid:
-    grid: dict[Coordinate, Cell] = field(default_factory=dict)
-
-    def add(self, pos: Coordinate, cell: Cell):
-        self.grid[pos] = cell
-
-    def get(self, pos: Coordinate) -> Cell | None:
-        return self.grid.get(pos)
-
-    def traverse(self):
-        yield from self.grid.items()
-
-
-def unit_directions():
-    for j in [-1, 0, 1]:
-        for i in [-1, 0, 1]:
-            if i == 0 and j == 0:
-                continue
-            yield Coordinate(i, j)
-
-
-def diagonals():
-    yield Coordinate(1, 1), Coordinate(1, -1)
-    yield Coordinate(1, -1), Coordinate(-1, -1)
-    yield Coordinate(-1, -1), Coordinate(-1, 1)
-    yield Coordinate(-1, 1), Coordinate(1, 1)
-
-
-def neighbors(pos: Coordinate, include_self: bool = False):
-    for c in unit_directions():
-        yield pos + c
-
-    if include_self:
-        yield pos
-
-
-def travel(direction: Coordinate, start: Coordinate):
-    return start + direction
-
-
-def matches(grid: Grid, direction: Coordinate, start: Coordinate, target: str):
-    gathered = []
+def matches(grid: common.Grid, direction: int, start: int, target: bytes):
+    # the border never matches a letter, so this can't walk further than one cell off the grid
     for i, char in enumerate(target):
-        examine = grid.get(start + (direction * i))
-        if examine and examine.value == char:
-            gathered.append(char)
-        else:
-            break
-    return len(gathered) == len(target)
+        if grid[start + direction * i] != char:
+            return False
+    return True
 
 
-def search(grid: Grid, target: str):
+def search(grid: common.Grid, target: str):
+    encoded = target.encode()
     found = 0
-    for pos, _ in grid.traverse():
-        for direction in unit_directions():
-            if matches(grid, direction, pos, target):
+    for pos in grid.indices():
+        for direction in grid.neighbors:
+            if matches(grid, direction, pos, encoded):
                 found += 1
     return found
 
 
-def xmas(grid: Grid):
+def xmas(grid: common.Grid):
+    m, s = ord("M"), ord("S")
     found = 0
-    for pos, cell in grid.traverse():
-        if cell.value == "A":
-            for d1, d2 in diagonals():
-                upper1 = grid.get(pos + d1)
-                lower1 = grid.get(pos + (d1 * -1))
-                upper2 = grid.get(pos + d2)
-                lower2 = grid.get(pos + (d2 * -1))
-                if (
-                    upper1
-                    and lower1
-                    and upper2
-                    and lower2
-                    and upper1.value == "M"
-                    and lower1.value == "S"
-                    and upper2.value == "M"
-                    and lower2.value == "S"
-                ):
-                    found += 1
+    for pos in grid.find("A"):
+        for d1, d2 in diagonals(grid):
+            if grid[pos + d1] == m and grid[pos - d1] == s and grid[pos + d2] == m and grid[pos - d2] == s:
+                found += 1
     return found
 
 
@@ -113,19 +47,16 @@ def xmas(grid: Grid):
 class WordSearch(common.LineConsumer):
     """The full data file, with a single list member that contains every line of the file."""
 
-    grid: Grid = field(default_factory=lambda: Grid())
+    grid: common.Grid
 
     @classmethod
     def from_lines(cls: type[t.Self], data_iter: t.Iterator[str]) -> t.Self:
-        word_search = cls()
-        row = 0
+        lines = []
         with contextlib.suppress(StopIteration):
             while line := next(data_iter):
-                for col, char in enumerate(line):
-                    word_search.grid.add(Coordinate(col, row), Cell(char))
-                row += 1
+                lines.append(line)
 
-        return word_search
+        return cls(common.Grid.from_rows(lines))
 
 
 def part1(data: WordSearch):
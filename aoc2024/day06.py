@@ -2,121 +2,54 @@ from __future__ import annotations
 import contextlib
 import typing as t
 from dataclasses import dataclass
-from dataclasses import field
 from itertools import cycle
 
 import common
 
-
-@dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
-
-    def __add__(self, other: Coordinate):
-        return Coordinate(self.x + other.x, self.y + other.y)
-
-    def __mul__(self, other: int):
-        return Coordinate(self.x * other, self.y * other)
-
-
-@dataclass
-class Cell:
-    value: str
+BLOCKED = {ord("#"), ord("O")}
 
 
 @dataclass
 class SecurityGuard(common.LineConsumer):
     """The full data file, with a single list member that contains every line of the file."""
 
-    obstacles: Grid = field(default_factory=lambda: Grid())
-    guard_position: Coordinate = field(default_factory=lambda: Coordinate(-1, -1))
-    extents: Coordinate = field(default_factory=lambda: Coordinate(-1, -1))
+    obstacles: common.Grid
+    guard_position: int
 
     @classmethod
     def from_lines(cls: type[t.Self], data_iter: t.Iterator[str]) -> t.Self:
-        room = cls()
-        row = 0
-        width = 0
+        lines = []
         with contextlib.suppress(StopIteration):
             while line := next(data_iter):
-                width = len(line)
-                for col, char in enumerate(line):
-                    if char == "#":
-                        room.obstacles.add(Coordinate(col, row), Cell(char))
-                    elif char == "^":
-                        room.guard_position = Coordinate(col, row)
-                row += 1
-
-        room.extents = Coordinate(width, row)
-        return room
-
-
-@dataclass
-class Grid:
-    grid: dict[Coordinate, Cell] = field(default_factory=dict)
-
-    def add(self, pos: Coordinate, cell: Cell):
-        self.grid[pos] = cell
-
-    def remove(self, pos: Coordinate) -> Cell | None:
-        return self.grid.pop(pos, None)
-
-    def get(self, pos: Coordinate) -> Cell | None:
-        return self.grid.get(pos)
-
-    def traverse(self):
-        yield from self.grid.items()
-
-
-def unit_directions():
-    for j in [-1, 0, 1]:
-        for i in [-1, 0, 1]:
-            if i == 0 and j == 0:
-                continue
-            yield Coordinate(i, j)
-
-
-def neighbors(pos: Coordinate, include_self: bool = False):
-    for c in unit_directions():
-        yield pos + c
-
-    if include_self:
-        yield pos
-
+                lines.append(line)
 
-def travel(direction: Coordinate, start: Coordinate):
-    return start + direction
+        obstacles = common.Grid.from_rows(lines)
+        guard_position = next(obstacles.find("^"))
+        obstacles[guard_position] = ord(".")
+        return cls(obstacles, guard_position)
 
 
-def leaves(pos: Coordinate, extents: Coordinate):
-    return not (pos.x >= 0 and pos.x < extents.x and pos.y >= 0 and pos.y < extents.y)
+def leaves(pos: int, obstacles: common.Grid):
+    return obstacles[pos] == obstacles.border
 
 
-def try_move(pos: Coordinate, direction: Coordinate, obstacles: Grid):
-    new_pos = travel(direction, pos)
-    if obstacles.get(new_pos) is None:
+def try_move(pos: int, direction: int, obstacles: common.Grid):
+    new_pos = pos + direction
+    if obstacles[new_pos] not in BLOCKED:
         return new_pos
 
 
-def get_cardinals():
-    yield from cycle(
-        [
-            Coordinate(0, -1),
-            Coordinate(1, 0),
-            Coordinate(0, 1),
-            Coordinate(-1, 0),
-        ]
-    )
+def get_cardinals(obstacles: common.Grid):
+    yield from cycle(obstacles.cardinals)
 
 
 def part1(data: SecurityGuard):
-    cardinals = get_cardinals()
+    cardinals = get_cardinals(data.obstacles)
     facing = next(cardinals)
     current = data.guard_position
-    visit: dict[Coordinate, int] = {}
+    visit: dict[int, int] = {}
 
-    while not leaves(current, data.extents):
+    while not leaves(current, data.obstacles):
         visit.setdefault(current, 0)
         visit[current] += 1
         next_pos = try_move(current, facing, data.obstacles)
@@ -133,22 +66,21 @@ def part1(data: SecurityGuard):
 
 
 def does_it_loop(
-    facing: Coordinate,
-    start: Coordinate,
-    been_there: t.Mapping[Coordinate, t.Iterable[Coordinate]],
-    obstacles: Grid,
-    extents: Coordinate,
+    facing: int,
+    start: int,
+    been_there: t.Mapping[int, t.Iterable[int]],
+    obstacles: common.Grid,
 ):
-    cardinals = get_cardinals()
+    cardinals = get_cardinals(obstacles)
     while next(cardinals) != facing:
         pass
 
-    visit: dict[Coordinate, t.Set[Coordinate]] = {}
+    visit: dict[int, t.Set[int]] = {}
     for k, v in been_there.items():
         visit[k] = {d for d in v}
 
     current = start
-    while not leaves(current, extents):
+    while not leaves(current, obstacles):
         visit.setdefault(current, set()).add(facing)
         next_pos = try_move(current, facing, obstacles)
 
@@ -164,15 +96,15 @@ def does_it_loop(
 
 
 def part2(data: SecurityGuard):
-    cardinals = get_cardinals()
+    cardinals = get_cardinals(data.obstacles)
     facing = next(cardinals)
 
     current = data.guard_position
-    visit: dict[Coordinate, t.Set[Coordinate]] = {}
-    placeholder = Cell("O")
+    visit: dict[int, t.Set[int]] = {}
+    placeholder = ord("O")
     loop_obstacle_positions = set()
 
-    while not leaves(current, data.extents):
+    while not leaves(current, data.obstacles):
         visit.setdefault(current, set()).add(facing)
         next_pos = try_move(current, facing, data.obstacles)
         while next_pos is None:
@@ -181,10 +113,11 @@ def part2(data: SecurityGuard):
 
         if next_pos != data.guard_position and next_pos not in visit:
             # pretend there's an obstacle here instead.
-            data.obstacles.add(next_pos, placeholder)
-            if does_it_loop(facing, current, visit, data.obstacles, data.extents):
+            was = data.obstacles[next_pos]
+            data.obstacles[next_pos] = placeholder
+            if does_it_loop(facing, current, visit, data.obstacles):
                 loop_obstacle_positions.add(next_pos)
-            data.obstacles.remove(next_pos)
+            data.obstacles[next_pos] = was
 
         current = next_pos
 
@@ -32,19 +32,7 @@ class City(common.LineConsumer):
         return cityscape
 
 
-@dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
-
-    def __add__(self, other: Coordinate):
-        return Coordinate(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other: Coordinate):
-        return Coordinate(self.x - other.x, self.y - other.y)
-
-    def __mul__(self, other: int):
-        return Coordinate(self.x * other, self.y * other)
+Coordinate = common.Coordinate
 
 
 def inside(pos: Coordinate, extents: Coordinate):
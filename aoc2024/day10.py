@@ -2,107 +2,48 @@ from __future__ import annotations
 import contextlib
 import typing as t
 from dataclasses import dataclass
-from dataclasses import field
 import heapq
 
 import common
 
 
+NO_HEIGHT = 255
+# maps the digit characters to their values, and everything else (including the border) to NO_HEIGHT
+HEIGHTS = bytes(c - ord("0") if chr(c).isdigit() else NO_HEIGHT for c in range(256))
+
+
 @dataclass
 class Topography(common.LineConsumer):
-    grid: Grid
-    trail_heads: list[Coordinate]
+    grid: common.Grid
+    trail_heads: list[int]
 
     @classmethod
     def from_lines(cls: type[t.Self], data_iter: t.Iterator[str]) -> t.Self:
-        # this is implemented overly verbosely to facilitate customization.
-        positions: list[list[int | None]] = []
-        trail_heads: list[Coordinate] = []
+        lines = []
         with contextlib.suppress(StopIteration):
-            row_num = 0
             while line := next(data_iter):
-                row = []
-                for i, c in enumerate(line):
-                    if c.isdigit():
-                        val = int(c)
-                        row.append(val)
-                        if val == 0:
-                            trail_heads.append(Coordinate(i, row_num))
-                    else:
-                        row.append(None)
-
-                positions.append(row)
-                row_num += 1
-
-        return cls(
-            Grid(Coordinate(len(positions), len(positions[0])), positions),
-            trail_heads,
-        )
-
-
-@dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
-
-    def __add__(self, other: Coordinate):
-        return Coordinate(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other: Coordinate):
-        return Coordinate(self.x - other.x, self.y - other.y)
-
-    def __mul__(self, other: int):
-        return Coordinate(self.x * other, self.y * other)
+                lines.append(line)
 
-    def __lt__(self, other):
-        return (self.x, self.y) < (other.x, other.y)
+        grid = common.Grid.from_rows(lines, border=NO_HEIGHT)
+        grid.cells = grid.cells.translate(HEIGHTS)
+        return cls(grid, list(grid.find(0)))
 
 
-@dataclass
-class Grid:
-    size: Coordinate
-    values: list[list[int | None]]
-
-    @classmethod
-    def empty(cls, size: Coordinate):
-        positions = []
-        for _ in range(size.y):
-            positions.append([None for __ in range(size.x)])
-        return cls(size, positions)
-
-    def at(self, pos: Coordinate):
-        if pos.x >= self.size.x or pos.x < 0 or pos.y >= self.size.y or pos.y < 0:
-            return None
-        return self.values[pos.y][pos.x]
-
-
-def cardinals():
-    yield from [
-        Coordinate(0, -1),
-        Coordinate(1, 0),
-        Coordinate(0, 1),
-        Coordinate(-1, 0),
-    ]
-
-
-def neighbor_coords(pos: Coordinate, include_self: bool = False):
-    for c in cardinals():
+def neighbor_coords(pos: int, grid: common.Grid):
+    for c in grid.cardinals:
         yield pos + c
 
-    if include_self:
-        yield pos
-
 
-def score_trail(start: Coordinate, grid: Grid):
-    nines: t.Set[Coordinate] = set()
-    visited: dict[Coordinate, int] = {}
-    edges: list[tuple[int, int, Coordinate]] = []
+def score_trail(start: int, grid: common.Grid):
+    nines: t.Set[int] = set()
+    visited: dict[int, int] = {}
+    edges: list[tuple[int, int, int]] = []
     heapq.heappush(edges, (0, 0, start))
     # bail = 4
     while edges:
         # print(edges)
         distance, height, pos = heapq.heappop(edges)
-        edge_val = grid.at(pos)
+        edge_val = grid[pos]
         # print("considering", pos, distance, height, "=", edge_val)
         if edge_val == height:
             # print("visiting", pos)
@@ -111,7 +52,7 @@ def score_trail(start: Coordinate, grid: Grid):
                 # print("END OF TRAIL!")
                 nines.add(pos)
             else:
-                for neighbor in neighbor_coords(pos):
+                for neighbor in neighbor_coords(pos, grid):
                     if visited.get(neighbor, -1) < distance + 1:
                         # print("adding", distance + 1, height + 1, neighbor)
                         heapq.heappush(edges, (distance + 1, height + 1, neighbor))
@@ -121,18 +62,18 @@ def score_trail(start: Coordinate, grid: Grid):
     return len(nines)
 
 
-def collect(pos: Coordinate, grid: Grid, so_far: t.Set[Coordinate]) -> t.Set[t.FrozenSet[Coordinate]]:
-    pass_on: t.Set[Coordinate] = {pos} | so_far
-    height = grid.at(pos)
+def collect(pos: int, grid: common.Grid, so_far: t.Set[int]) -> t.Set[t.FrozenSet[int]]:
+    pass_on: t.Set[int] = {pos} | so_far
+    height = grid[pos]
 
-    if height is None:
+    if height == NO_HEIGHT:
         return set()
     if height == 9:
         return {frozenset(pass_on)}
 
     result = set()
-    for n in neighbor_coords(pos):
-        if grid.at(n) == height + 1:
+    for n in neighbor_coords(pos, grid):
+        if grid[n] == height + 1:
             result |= collect(n, grid, pass_on)
 
     return result
@@ -2,92 +2,46 @@ from __future__ import annotations
 import contextlib
 import typing as t
 from dataclasses import dataclass
-from dataclasses import field
 
 import common
 
 
 @dataclass
 class Farm(common.LineConsumer):
-    grid: Grid
-    extents: Coordinate
+    grid: common.Grid
 
     @classmethod
     def from_lines(cls: type[t.Self], data_iter: t.Iterator[str]) -> t.Self:
-        # this is implemented overly verbosely to facilitate customization.
-        grid = Grid()
-        width = 0
+        lines = []
         with contextlib.suppress(StopIteration):
-            row_num = 0
             while line := next(data_iter):
-                width = len(line)
-                for i, c in enumerate(line):
-                    grid.add(Coordinate(i, row_num), c)
-                row_num += 1
+                lines.append(line)
 
-        return cls(grid, Coordinate(width, row_num))
+        return cls(common.Grid.from_rows(lines))
 
 
-@dataclass
-class Grid:
-    grid: dict[Coordinate, str] = field(default_factory=dict)
-
-    def add(self, pos: Coordinate, cell: str):
-        self.grid[pos] = cell
-
-    def get(self, pos: Coordinate) -> str | None:
-        return self.grid.get(pos)
-
-
-@dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
-
-    def __add__(self, other: Coordinate):
-        return Coordinate(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other: Coordinate):
-        return Coordinate(self.x - other.x, self.y - other.y)
-
-    def __mul__(self, other: int):
-        return Coordinate(self.x * other, self.y * other)
-
-    def __lt__(self, other):
-        return (self.x, self.y) < (other.x, other.y)
-
-
-def cardinals():
-    yield from [
-        Coordinate(0, -1),
-        Coordinate(1, 0),
-        Coordinate(0, 1),
-        Coordinate(-1, 0),
-    ]
-
-
-def get_neighbor_coords(pos: Coordinate):
-    for direction in cardinals():
+def get_neighbor_coords(pos: int, grid: common.Grid):
+    for direction in grid.cardinals:
         yield pos + direction
 
 
-def collect(start: Coordinate, available: t.Collection[Coordinate], grid: Grid) -> tuple[t.Set[Coordinate], int, int]:
+def collect(start: int, available: t.Collection[int], grid: common.Grid) -> tuple[t.Set[int], int, int]:
     our_available = set(available)
     perimeter = 4
     collected = {start}
     border = [start]
-    kind = grid.get(start)
-    if kind is None:
-        raise RuntimeError(f"Farm has an unset kind at {start}")
+    kind = grid[start]
+    if kind == grid.border:
+        raise RuntimeError(f"Farm has an unset kind at {grid.coords(start)}")
     # print(kind)
     # print("starting with", collected)
 
     while border:
         consider = border.pop()
-        for option in get_neighbor_coords(consider):
-            if option in our_available and grid.get(option) == kind:
+        for option in get_neighbor_coords(consider, grid):
+            if option in our_available and grid[option] == kind:
                 # print("adding", option)
-                neighbors = set(get_neighbor_coords(option))
+                neighbors = set(get_neighbor_coords(option, grid))
                 # print("neighbors of", option, "are", neighbors)
                 # print("already have", neighbors & collected)
                 perimeter += 4 - 2 * len(neighbors & collected)
@@ -102,7 +56,7 @@ def collect(start: Coordinate, available: t.Collection[Coordinate], grid: Grid)
 
 def part1(data: Farm):
     visited = set()
-    available = set(data.grid.grid.keys())
+    available = set(data.grid.indices())
     total_price = 0
     while available:
         consider = available.pop()
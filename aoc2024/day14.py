@@ -18,25 +18,7 @@ class Robot(common.LineConsumer):
         return cls(parse_assignment("p=", pos), parse_assignment("v=", vel))
 
 
-@dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
-
-    def __add__(self, other: Coordinate):
-        return Coordinate(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other: Coordinate):
-        return Coordinate(self.x - other.x, self.y - other.y)
-
-    def __mul__(self, other: int):
-        return Coordinate(self.x * other, self.y * other)
-
-    def __lt__(self, other: Coordinate) -> bool:
-        return (self.x, self.y) < (other.x, other.y)
-
-    def __mod__(self, other: Coordinate):
-        return Coordinate(self.x % other.x, self.y % other.y)
+Coordinate = common.Coordinate
 
 
 def parse_assignment(label: str, val) -> Coordinate:
@@ -77,21 +59,20 @@ def calc_seconds(data: t.Iterable[Robot], extents: Coordinate, seconds: int):
     return final
 
 
-def cog(coords: t.Sequence[Coordinate]) -> Coordinate:
-    total = Coordinate(0, 0)
-    for c in coords:
-        total += c
-    num_coords = len(coords)
-    return Coordinate(total.x // num_coords, total.y // num_coords)
+def calc_packed(data: t.Iterable[Robot], extents: Coordinate, seconds: int) -> set[int]:
+    """Just the occupied positions after seconds, as Coordinate.pack(extents.x) ints."""
+    w, h = extents.x, extents.y
+    return {
+        (r.position.y + r.velocity.y * seconds) % h * w + (r.position.x + r.velocity.x * seconds) % w for r in data
+    }
 
 
-def manhattan(a: Coordinate, b: Coordinate) -> int:
-    c = a - b
-    return abs(c.x) + abs(c.y)
+def cog(xs: t.Sequence[int], ys: t.Sequence[int]) -> Coordinate:
+    return Coordinate(sum(xs) // len(xs), sum(ys) // len(ys))
 
 
-def avg_dist(coords: t.Sequence[Coordinate], center: Coordinate) -> float:
-    return sum(manhattan(c, center) for c in coords) / len(coords)
+def avg_dist(xs: t.Sequence[int], ys: t.Sequence[int], center: Coordinate) -> float:
+    return (sum(abs(x - center.x) for x in xs) + sum(abs(y - center.y) for y in ys)) / len(xs)
 
 
 def part1(data: t.Iterable[Robot], extents=Coordinate(101, 103), seconds: int = 100):
@@ -113,16 +94,18 @@ def part2(data: t.Iterable[Robot], extents=Coordinate(101, 103)):
     min_avg = 9999999
     smallest_avg_second = 0
     for seconds in range(1, 10000):
-        current = calc_seconds(data, extents, seconds)
-        coords = list(current.keys())
-        curr_cog = cog(coords)
-        avg = avg_dist(coords, curr_cog)
+        # this runs for every robot, every second, so stay with packed ints rather than Coordinates
+        packed = calc_packed(data, extents, seconds)
+        xs = [p % extents.x for p in packed]
+        ys = [p // extents.x for p in packed]
+        curr_cog = cog(xs, ys)
+        avg = avg_dist(xs, ys, curr_cog)
         min_avg = min(min_avg, avg)
         if min_avg == avg:
             smallest_avg_second = seconds
             print("average got smaller at", seconds, curr_cog, avg)
         if avg < 25.5:
-            show_grid(current, extents)
+            show_grid(calc_seconds(data, extents, seconds), extents)
 
     # this may not be right, you'll have to scan the output to see if there was more than one
     return smallest_avg_second
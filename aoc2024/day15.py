@@ -2,36 +2,42 @@ from __future__ import annotations
 import contextlib
 import typing as t
 from dataclasses import dataclass
-from dataclasses import field
 
 import common
 
+WALL = ord("#")
+BOX = ord("O")
+EMPTY = ord(".")
+
 
 @dataclass
 class Warehouse(common.LineConsumer):
-    grid: Grid
-    robot: Coordinate
-    instructions: list[Coordinate]
+    grid: common.Grid
+    robot: int
+    instructions: list[int]
 
     @classmethod
     def from_lines(cls: type[t.Self], data_iter: t.Iterator[str]) -> t.Self:
-        grid = Grid()
-        robot = None
+        lines = []
         with contextlib.suppress(StopIteration):
-            row_num = 0
             while line := next(data_iter):
-                for i, c in enumerate(line):
-                    if c in {"#", "O"}:
-                        grid.add(Coordinate(i, row_num), c)
-                    elif c == "@":
-                        robot = Coordinate(i, row_num)
-
-                row_num += 1
+                lines.append(line)
 
+        # the warehouse is walled in, but the border is a wall too, just in case.
+        grid = common.Grid.from_rows(lines, border="#")
+        robot = next(grid.find("@"), None)
         if robot is None:
             raise RuntimeError("Could not find robot in input!")
-
-        istructions: list[Coordinate] = []
+        grid[robot] = EMPTY
+
+        N, E, S, W = grid.cardinals
+        cardinals_by_input = {
+            "^": N,
+            ">": E,
+            "v": S,
+            "<": W,
+        }
+        istructions: list[int] = []
         with contextlib.suppress(StopIteration):
             while line := next(data_iter):
                 for i in line:
@@ -40,95 +46,28 @@ class Warehouse(common.LineConsumer):
         return cls(grid, robot, istructions)
 
 
-@dataclass
-class Grid:
-    grid: dict[Coordinate, str] = field(default_factory=dict)
-
-    def clone(self):
-        return Grid(self.grid.copy())
-
-    def add(self, pos: Coordinate, cell: str):
-        self.grid[pos] = cell
-
-    def remove(self, pos: Coordinate):
-        return self.grid.pop(pos, None)
-
-    def at(self, pos: Coordinate) -> str | None:
-        return self.grid.get(pos)
-
-    def print(self: Grid, robot: Coordinate):
-        size = Coordinate(0, 0)
-        for coord in self.grid:
-            size = max(size, coord)
-        for y in range(size.y + 1):
-            for x in range(size.x + 1):
-                pos = Coordinate(x, y)
-                if pos == robot:
-                    print("@", end="")
-                    continue
-                val = self.at(pos)
-                if val:
-                    print(val, end="")
-                else:
-                    print(".", end="")
-            print()
-
-
-@dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
-
-    def __add__(self, other: Coordinate):
-        return Coordinate(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other: Coordinate):
-        return Coordinate(self.x - other.x, self.y - other.y)
-
-    def __mul__(self, other: int):
-        return Coordinate(self.x * other, self.y * other)
-
-    def __lt__(self, other: Coordinate) -> bool:
-        return (self.x, self.y) < (other.x, other.y)
-
-    def __mod__(self, other: Coordinate):
-        return Coordinate(self.x % other.x, self.y % other.y)
-
-
-def cardinals():
-    yield from [
-        Coordinate(0, -1),
-        Coordinate(1, 0),
-        Coordinate(0, 1),
-        Coordinate(-1, 0),
-    ]
-
-
-cardinal_list = [c for c in cardinals()]
-N, W, S, E = cardinal_list
-cardinals_by_input = {
-    "^": N,
-    ">": W,
-    "v": S,
-    "<": E,
-}
+def print_warehouse(grid: common.Grid, robot: int):
+    shown = grid.copy()
+    shown[robot] = ord("@")
+    print(shown)
 
 
-def scan_to_empty(start: Coordinate, direction: Coordinate, grid: Grid) -> Coordinate | None:
+def scan_to_empty(start: int, direction: int, grid: common.Grid) -> int | None:
     """Assumes we'll hit a wall before leaving the search space"""
     current = start
-    while consider := (current + direction):
-        val = grid.at(consider)
-        if val == "#":
+    while True:
+        consider = current + direction
+        val = grid[consider]
+        if val == WALL:
             return None
-        elif val is None:
+        elif val == EMPTY:
             return consider
         current = consider
 
 
 def part1(data: Warehouse):
     inst_stack = list(reversed(data.instructions))
-    grid = data.grid.clone()
+    grid = data.grid.copy()
     robot = data.robot
     while inst_stack:
         inst = inst_stack.pop()
@@ -137,12 +76,13 @@ def part1(data: Warehouse):
             continue
 
         move = robot + inst
-        if (box := grid.remove(move)) is not None:
-            grid.add(try_move, box)
+        if grid[move] == BOX:
+            grid[move] = EMPTY
+            grid[try_move] = BOX
         robot = move
 
-    grid.print(robot)
-    return sum(pos.y * 100 + pos.x for pos, val in grid.grid.items() if val == "O")
+    print_warehouse(grid, robot)
+    return sum(100 * y + x for x, y in map(grid.coords, grid.find(BOX)))
 
 
 def part2(data: Warehouse):
@@ -1,8 +1,6 @@
 from __future__ import annotations
-import contextlib
 import typing as t
 from dataclasses import dataclass
-from dataclasses import field
 import heapq
 
 import common
@@ -21,182 +19,75 @@ class ParsedCoord(common.LineConsumer):
         return cls(Coordinate(int(x), int(y)))
 
 
-@dataclass
-class Grid:
-    grid: dict[Coordinate, str] = field(default_factory=dict)
-
-    def clone(self):
-        return Grid(self.grid.copy())
-
-    def add(self, pos: Coordinate, cell: str):
-        self.grid[pos] = cell
-
-    def remove(self, pos: Coordinate):
-        return self.grid.pop(pos, None)
-
-    def at(self, pos: Coordinate) -> str | None:
-        return self.grid.get(pos)
-
-    def print(
-        self: Grid,
-        visited: dict[tuple[Coordinate, Coordinate], int],
-        edges: list[tuple[int, Coordinate, Coordinate]],
-    ):
-        visited_set = {c for c, _ in visited}
-        edge_set = {c for _, __, c in edges}
-        size = Coordinate(0, 0)
-        for coord in self.grid:
-            size = max(size, coord)
-        for y in range(size.y + 2):
-            for x in range(size.x + 2):
-                pos = Coordinate(x, y)
-                if pos in edge_set:
-                    print("0", end="")
-                    continue
-                if pos in visited_set:
-                    print("X", end="")
-                    continue
-                val = self.at(pos)
-                if val:
-                    print(val, end="")
-                else:
-                    print("#", end="")
-            print()
-
-
-@dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
+Coordinate = common.Coordinate
 
-    def __add__(self, other: Coordinate):
-        return Coordinate(self.x + other.x, self.y + other.y)
 
-    def __sub__(self, other: Coordinate):
-        return Coordinate(self.x - other.x, self.y - other.y)
+OPEN = ord(".")
+CORRUPTED = ord("#")
 
-    def __mul__(self, other: int):
-        return Coordinate(self.x * other, self.y * other)
 
-    def __lt__(self, other: Coordinate) -> bool:
-        return (self.x, self.y) < (other.x, other.y)
+def navigate(start: int, end: int, grid: common.Grid, any_path: bool = False):
+    N, E, S, W = grid.cardinals
+    turns = {
+        # dir: (ccw, cw)
+        N: (W, E),
+        E: (N, S),
+        S: (E, W),
+        W: (S, N),
+    }
 
-    def __mod__(self, other: Coordinate):
-        return Coordinate(self.x % other.x, self.y % other.y)
-
-
-def navigate(start: Coordinate, end: Coordinate, grid: Grid, any_path: bool = False):
     heading = E
     min_cost = 9_999_999_999
-    visited: dict[tuple[Coordinate, Coordinate], int] = {}
-    edges: list[tuple[int, Coordinate, Coordinate]] = []
+    visited: dict[tuple[int, int], int] = {}
+    edges: list[tuple[int, int, int]] = []
     heapq.heappush(edges, (0, heading, start))
-    # bail = 100
     while edges:
-        # print(edges)
         cost, in_heading, pos = heapq.heappop(edges)
-        # print("visiting", pos, cost, heading)
         prev_cost = visited.get((pos, in_heading), 9_999_999_999)
         visited[pos, in_heading] = min(cost, prev_cost)
-        # print("set visisted at", pos, "to", visited[pos, in_heading])
         if prev_cost <= cost:
             continue
         if pos == end:
-            # print(f"Found the end!")
-            # grid.print(visited, edges)
             min_cost = min(min_cost, cost)
             if any_path:
                 return min_cost
         else:
-            for neighbor, new_heading, next_cost in neighbor_coords(pos, in_heading):
-                if grid.at(neighbor) is None:
-                    # print("discarding(1)", neighbor)
-                    if neighbor == Coordinate(x=139, y=1):
-                        # print("discarded(1) the end as a neighbor")
-                        pass
+            for neighbor, new_heading, next_cost in neighbor_coords(pos, in_heading, turns):
+                if grid[neighbor] != OPEN:
                     continue
                 if visited.get((neighbor, new_heading), 9_999_999_999) > cost + next_cost:
-                    # print("adding", cost + next_cost, new_heading, neighbor)
-                    if neighbor == Coordinate(x=139, y=1):
-                        # print("added the end as a neighbor")
-                        pass
                     heapq.heappush(edges, (cost + next_cost, new_heading, neighbor))
-                else:
-                    if neighbor == Coordinate(x=139, y=1):
-                        # print(
-                        #     "discarded(2) the end as a neighbor",
-                        #     visited.get((neighbor, new_heading), 9_999_999_999),
-                        #     "<=",
-                        #     cost + next_cost,
-                        # )
-                        pass
-                    # print("discarding(2)", neighbor)
-                    pass
-        # grid.print(visited, edges)
-        # if not bail:
-        #     print("yes, we bail")
-        #     break
-        # bail -= 1
-    # grid.print(visited, edges)
     return min_cost
 
 
-def cardinals():
-    yield from [
-        Coordinate(0, -1),
-        Coordinate(1, 0),
-        Coordinate(0, 1),
-        Coordinate(-1, 0),
-    ]
-
-
-cardinal_list = [c for c in cardinals()]
-N, E, S, W = cardinal_list
-turns = {
-    # dir: (ccw, cw)
-    N: (W, E),
-    E: (N, S),
-    S: (E, W),
-    W: (S, N),
-}
-
-
-def neighbor_coords(pos: Coordinate, heading: Coordinate):
+def neighbor_coords(pos: int, heading: int, turns: t.Mapping[int, tuple[int, int]]):
     yield pos + heading, heading, 1
     ccw, cw = turns[heading]
     yield pos + ccw, ccw, 1
     yield pos + cw, cw, 1
 
 
-def part1(data: t.Sequence[ParsedCoord], size=70, count=1024):
-    memory = Grid()
-    start = Coordinate(0, 0)
-    end = Coordinate(size, size)
-    for j in range(size + 1):
-        for i in range(size + 1):
-            memory.add(Coordinate(i, j), ".")
-
+def make_memory(data: t.Sequence[ParsedCoord], size: int, count: int) -> common.Grid:
+    memory = common.Grid.empty(size + 1, size + 1, border="#")
     for i in range(count):
-        memory.remove(data[i].pos)
+        memory[memory.index(data[i].pos.x, data[i].pos.y)] = CORRUPTED
+    return memory
 
-    return navigate(start, end, memory)
+
+def part1(data: t.Sequence[ParsedCoord], size=70, count=1024):
+    memory = make_memory(data, size, count)
+    return navigate(memory.index(0, 0), memory.index(size, size), memory)
 
 
 def part2(data: t.Sequence[ParsedCoord], size=70, count=1024):
-    memory = Grid()
-    start = Coordinate(0, 0)
-    end = Coordinate(size, size)
+    memory = make_memory(data, size, count)
+    start = memory.index(0, 0)
+    end = memory.index(size, size)
     max_steps = (count + 1) ** 2
-    for j in range(size + 1):
-        for i in range(size + 1):
-            memory.add(Coordinate(i, j), ".")
-
-    for i in range(count):
-        memory.remove(data[i].pos)
 
     print(len(data))
     for i in range(count, len(data)):
-        memory.remove(data[i].pos)
+        memory[memory.index(data[i].pos.x, data[i].pos.y)] = CORRUPTED
         print(i, data[i].pos)
         next_try = navigate(start, end, memory)
         if next_try > max_steps:
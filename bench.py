@@ -0,0 +1,346 @@
+import contextlib
+import io
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import typing as t
+from dataclasses import dataclass
+from dataclasses import field
+from types import ModuleType
+
+import common
+
+Phase = t.Literal["load", "parse", "part1", "part2"]
+phases: tuple[Phase, ...] = t.get_args(Phase)
+
+Wrapper = t.Callable[[Phase, t.Callable], t.Callable]
+
+
+@contextlib.contextmanager
+def instrumented(module: ModuleType, wrap: Wrapper):
+    """Route common's loading and parsing functions and the module's part1/part2 through wrap while active.
+
+    Solutions look these up as globals at call time, so `solution()` and `test()` pick up the wrapped
+    versions without any changes to the day modules themselves.
+    """
+    targets: list[tuple[t.Any, str, Phase]] = [
+        (common, "load", "load"),
+        (common, "open_input", "load"),
+        (common, "parse", "parse"),
+        (common, "parse_all", "parse"),
+        (common, "parse_iter", "parse"),
+        (module, "part1", "part1"),
+        (module, "part2", "part2"),
+    ]
+    originals = []
+    try:
+        for owner, name, phase in targets:
+            fn = getattr(owner, name, None)
+            if fn is None:
+                continue
+            originals.append((owner, name, fn))
+            setattr(owner, name, wrap(phase, fn))
+        yield
+    finally:
+        for owner, name, fn in reversed(originals):
+            setattr(owner, name, fn)
+
+
+def percentile(samples: t.Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile, so p95 is always a time that was actually measured."""
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+@dataclass
+class PhaseStats:
+    samples: list[float] = field(default_factory=list)
+
+    @property
+    def min(self) -> float:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self.samples, 95)
+
+    def as_dict(self) -> dict[str, t.Any]:
+        return {
+            "runs": len(self.samples),
+            "min": self.min,
+            "median": self.median,
+            "p95": self.p95,
+        }
+
+
+class Clock:
+    """Times regions that can nest, like a part pulling records out of a stream as it goes.
+
+    Each region gets its own time, less whatever was spent in regions inside it.
+    """
+
+    def __init__(self):
+        self.active: list[float] = []
+
+    def run(self, call: t.Callable[[], t.Any]) -> tuple[t.Any, float]:
+        """call's result and its own time. If it raises, the exception gets the time as .elapsed."""
+        self.active.append(0.0)
+        start = time.perf_counter()
+        try:
+            result = call()
+        except BaseException as e:
+            e.elapsed = self.stop(start)  # type: ignore[attr-defined]
+            raise
+        return result, self.stop(start)
+
+    def stop(self, start: float) -> float:
+        elapsed = time.perf_counter() - start
+        inner = self.active.pop()
+        if self.active:
+            self.active[-1] += elapsed
+        return elapsed - inner
+
+
+class TimedFile:
+    """A file from common.open_input, with the time spent reading lines charged to load."""
+
+    def __init__(self, fp: t.TextIO, stream: t.Callable[[t.Iterator[str]], t.Iterator[str]]):
+        self.fp = fp
+        self.stream = stream
+
+    def __enter__(self) -> "TimedFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fp.close()
+
+    def __iter__(self) -> t.Iterator[str]:
+        return self.stream(iter(self.fp))
+
+
+def bench(module: ModuleType, entry: str = "solution", repeat: int = 10, warmup: int = 1) -> dict[Phase, PhaseStats]:
+    """Run module.entry warmup + repeat times, collecting wall time per phase from the measured runs.
+
+    Output printed by the solution is swallowed. A phase that is called more than once per run (like a
+    `test()` that checks several examples) contributes one sample per call. Streamed input is timed
+    as it's pulled through, so reading and parsing it is charged to load and parse, not to the part
+    doing the pulling, and each stream contributes one sample once it's done.
+    """
+    stats: dict[Phase, PhaseStats] = {phase: PhaseStats() for phase in phases}
+    recording = False
+    clock = Clock()
+
+    def record(phase: Phase, elapsed: float):
+        if recording:
+            stats[phase].samples.append(elapsed)
+
+    def timed_stream(phase: Phase, it: t.Iterator, spent: float = 0.0) -> t.Iterator:
+        try:
+            while True:
+                try:
+                    item, elapsed = clock.run(lambda: next(it))
+                except StopIteration as e:
+                    spent += e.elapsed  # type: ignore[attr-defined]
+                    return
+                spent += elapsed
+                yield item
+        finally:
+            record(phase, spent)
+
+    def wrap(phase: Phase, fn: t.Callable) -> t.Callable:
+        def timed(*args, **kwargs):
+            try:
+                result, elapsed = clock.run(lambda: fn(*args, **kwargs))
+            except BaseException as e:
+                record(phase, e.elapsed)  # type: ignore[attr-defined]
+                raise
+            if fn is parse_iter:
+                return timed_stream(phase, result, elapsed)
+            if fn is open_input:
+                return TimedFile(result, lambda lines: timed_stream(phase, lines, elapsed))
+            record(phase, elapsed)
+            return result
+
+        return timed
+
+    parse_iter, open_input = common.parse_iter, common.open_input
+    runner = getattr(module, entry)
+    with instrumented(module, wrap):
+        for i in range(warmup + repeat):
+            recording = i >= warmup
+            with contextlib.redirect_stdout(io.StringIO()):
+                runner()
+
+    return {phase: s for phase, s in stats.items() if s.samples}
+
+
+@dataclass
+class MemoryUsage:
+    """What one call of a part did to memory, as seen by tracemalloc.
+
+    peak is the most memory the call had allocated at once. allocations and sites count the blocks
+    the call had allocated and still held just as it returned, before its locals were released.
+    streamed is set when the part was handed its input as a stream, so the peak includes reading
+    and parsing it.
+    """
+
+    peak: int
+    allocations: int
+    sites: list[tuple[str, int, int]]  # (file:line, bytes, blocks)
+    streamed: bool = False
+
+    def as_dict(self) -> dict[str, t.Any]:
+        return {
+            "peak": self.peak,
+            "allocations": self.allocations,
+            "sites": [{"site": site, "bytes": size, "blocks": count} for site, size, count in self.sites],
+            "streamed": self.streamed,
+        }
+
+
+def measure_memory(fn: t.Callable, args: tuple, kwargs: dict, top: int = 5) -> tuple[t.Any, MemoryUsage]:
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+
+    code = getattr(fn, "__code__", None)
+    frame_of_call = None
+    at_return: tuple[int, tracemalloc.Snapshot] | None = None
+
+    def watch(frame, event, arg):
+        # by the time fn has returned its locals are gone, so catch it on the way out instead
+        nonlocal frame_of_call, at_return
+        if event == "call" and frame_of_call is None and frame.f_code is code:
+            frame_of_call = frame
+        elif event == "return" and frame is frame_of_call and at_return is None:
+            at_return = tracemalloc.get_traced_memory()[1], tracemalloc.take_snapshot()
+
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        previous = sys.getprofile()
+        sys.setprofile(watch)
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            sys.setprofile(previous)
+        if at_return is None:
+            at_return = tracemalloc.get_traced_memory()[1], tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    peak, after = at_return
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    grown = sorted((s for s in stats if s.size_diff > 0), key=lambda s: s.size_diff, reverse=True)
+    sites = [
+        (f"{os.path.relpath(s.traceback[0].filename)}:{s.traceback[0].lineno}", s.size_diff, s.count_diff)
+        for s in grown[:top]
+    ]
+    allocations = sum(s.count_diff for s in stats if s.count_diff > 0)
+    return result, MemoryUsage(peak - baseline, allocations, sites)
+
+
+def profile_memory(module: ModuleType, entry: str = "solution", top: int = 5, quiet: bool = True) -> dict[Phase, MemoryUsage]:
+    """Run module.entry once with each part under tracemalloc.
+
+    A part called more than once per run reports its hungriest call. This is far slower than a normal
+    run, so it's kept apart from the timing runs.
+    """
+    usage: dict[Phase, MemoryUsage] = {}
+
+    def wrap(phase: Phase, fn: t.Callable) -> t.Callable:
+        if phase not in ("part1", "part2"):
+            return fn
+
+        def measured(*args, **kwargs):
+            result, used = measure_memory(fn, args, kwargs, top=top)
+            used.streamed = any(isinstance(arg, t.Iterator) for arg in (*args, *kwargs.values()))
+            if phase not in usage or used.peak > usage[phase].peak:
+                usage[phase] = used
+            return result
+
+        return measured
+
+    with instrumented(module, wrap):
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            getattr(module, entry)()
+
+    return usage
+
+
+def over_budget(usage: t.Mapping[Phase, MemoryUsage], budget: int) -> list[str]:
+    return [
+        f"{phase} peaked at {format_bytes(u.peak)}, over the budget of {format_bytes(budget)}"
+        for phase, u in usage.items()
+        if u.peak > budget
+    ]
+
+
+def parse_bytes(val: str) -> int:
+    """A size like 512, 64K, 1.5M or 2G."""
+    scales = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    val = val.strip().upper().removesuffix("B")
+    if val and val[-1] in scales:
+        return int(float(val[:-1]) * scales[val[-1]])
+    return int(val)
+
+
+def format_bytes(size: float) -> str:
+    for unit, scale in [("GB", 1024**3), ("MB", 1024**2), ("KB", 1024)]:
+        if abs(size) >= scale:
+            return f"{size / scale:.2f}{unit}"
+    return f"{size:.0f}B"
+
+
+def format_memory_table(usage: t.Mapping[Phase, MemoryUsage]) -> str:
+    rows = [f"{'phase':<8}{'peak':>12}{'blocks':>10}  top sites"]
+    for phase, u in usage.items():
+        rows.append(f"{phase + ('*' if u.streamed else ''):<8}{format_bytes(u.peak):>12}{u.allocations:>10}")
+        for site, size, count in u.sites:
+            rows.append(f"{'':<8}{format_bytes(size):>12}{count:>10}  {site}")
+    if any(u.streamed for u in usage.values()):
+        rows.append("* input was streamed in, so this includes reading and parsing it")
+    return "\n".join(rows)
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def format_table(stats: t.Mapping[Phase, PhaseStats]) -> str:
+    rows = [f"{'phase':<8}{'runs':>6}{'min':>12}{'median':>12}{'p95':>12}"]
+    for phase, s in stats.items():
+        rows.append(
+            f"{phase:<8}{len(s.samples):>6}"
+            f"{format_seconds(s.min):>12}{format_seconds(s.median):>12}{format_seconds(s.p95):>12}"
+        )
+    for phase in ("load", "parse"):
+        if phase not in stats:
+            rows.append(f"no separate {phase} phase seen, any {phase} time is counted in the phase that did it")
+    return "\n".join(rows)
+
+
+def to_json(
+    stats: t.Mapping[Phase, PhaseStats],
+    memory: t.Mapping[Phase, MemoryUsage] | None = None,
+    **meta,
+) -> str:
+    phase_data = {phase: s.as_dict() for phase, s in stats.items()}
+    for phase, u in (memory or {}).items():
+        phase_data.setdefault(phase, {})["memory"] = u.as_dict()
+    return json.dumps({**meta, "phases": phase_data}, indent=2)
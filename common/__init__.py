@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import typing as t
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+
+from common import numtheory
+
+
+class LineConsumer(t.Protocol):
+    @classmethod
+    def from_lines(cls: t.Type[t.Self], data_iter: t.Iterator[str]) -> t.Self: ...
+
+
+T = t.TypeVar("T", bound=LineConsumer)
+
+
+@dataclass
+class WholeLine(LineConsumer):
+    """A single line, with a single data member containing the whole string."""
+
+    data: str
+
+    @classmethod
+    def from_lines(cls: t.Type[t.Self], data_iter: t.Iterator[str]) -> t.Self:
+        return cls(next(data_iter))
+
+
+@dataclass
+class WholeFile(LineConsumer):
+    """The full data file, with a single list member that contains every line of the file."""
+
+    lines: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_lines(cls: type[t.Self], data_iter: t.Iterator[str]) -> t.Self:
+        this_file = cls()
+        row = 0
+        with contextlib.suppress(StopIteration):
+            while line := next(data_iter):
+                this_file.lines.append(line)
+                row += 1
+
+        return this_file
+
+
+@dataclass
+class ParseCache:
+    """Parsed inputs pickled to disk, so repeat runs on the same input can skip parsing entirely.
+
+    Entries are keyed on the raw input plus the source of the factory's module (and this one), so
+    editing a parser invalidates its entries. Least recently used entries are evicted once the
+    directory grows past max_bytes.
+    """
+
+    directory: Path = Path("data/cache/parsed")
+    max_bytes: int = 256 * 1024 * 1024
+
+    def key(self, raw_data: str, factory: type, kind: str) -> str:
+        h = hashlib.sha256(raw_data.encode())
+        for module_name in dict.fromkeys([factory.__module__, __name__]):
+            module_file = getattr(sys.modules.get(module_name), "__file__", None)
+            if module_file is not None:
+                with open(module_file, "rb") as fp:
+                    h.update(hashlib.sha256(fp.read()).digest())
+        h.update(f"{factory.__module__}.{factory.__qualname__}:{kind}".encode())
+        return h.hexdigest()
+
+    def get(self, key: str) -> t.Any | None:
+        path = self.directory / f"{key}.pickle"
+        try:
+            with open(path, "rb") as fp:
+                value = pickle.load(fp)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # unreadable or from an incompatible version of the classes, just parse it again
+            path.unlink(missing_ok=True)
+            return None
+
+        os.utime(path)
+        return value
+
+    def put(self, key: str, value: t.Any):
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f"{key}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fp:
+            fp.write(data)
+        os.replace(tmp_path, self.directory / f"{key}.pickle")
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for path in self.directory.glob("*.pickle"):
+            with contextlib.suppress(FileNotFoundError):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def fetch(self, raw_data: str, factory: type, kind: str, compute: t.Callable[[], t.Any]) -> t.Any:
+        key = self.key(raw_data, factory, kind)
+        if (value := self.get(key)) is not None:
+            return value
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+
+@dataclass
+class MemoryParseCache(ParseCache):
+    """A ParseCache that keeps its entries in this process rather than on disk, for long running processes.
+
+    Entries are still stored pickled, so a solution that modifies its parsed input can't affect the next run.
+    """
+
+    entries: dict[str, bytes] = field(default_factory=dict)
+
+    def get(self, key: str) -> t.Any | None:
+        data = self.entries.pop(key, None)
+        if data is None:
+            return None
+        self.entries[key] = data
+        return pickle.loads(data)
+
+    def put(self, key: str, value: t.Any):
+        try:
+            self.entries[key] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        self.evict()
+
+    def evict(self):
+        total = sum(len(data) for data in self.entries.values())
+        # dicts keep insertion order and get re-inserts on a hit, so the first entry is the least recently used
+        while total > self.max_bytes and self.entries:
+            total -= len(self.entries.pop(next(iter(self.entries))))
+
+
+parse_cache: ParseCache | None = None
+"""When set, parse and parse_all go through this cache unless given a different one."""
+
+workers: int | None = None
+"""From --workers on a single day, for solutions that can spread their work over a process pool."""
+
+
+def parse(raw_data: str, factory: t.Type[T], cache: ParseCache | None = None) -> list[T]:
+    cache = cache or parse_cache
+    if cache is not None:
+        return cache.fetch(raw_data, factory, "parse", lambda: _parse(raw_data, factory))
+    return _parse(raw_data, factory)
+
+
+def _parse(raw_data: str, factory: t.Type[T]) -> list[T]:
+    lines_iter = iter(raw_data.splitlines())
+    parsed = []
+    while True:
+        try:
+            parsed.append(factory.from_lines(lines_iter))
+        except StopIteration:
+            break
+
+    return parsed
+
+
+def iter_lines(source: str | t.Iterable[str]) -> t.Iterator[str]:
+    """Lines from an open file, or any iterable of text chunks, without their line endings.
+
+    Chunks don't need to line up with lines; a line split across chunks is stitched back together.
+    """
+    if isinstance(source, str):
+        source = [source]
+
+    pending = ""
+    for chunk in source:
+        pending += chunk
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.removesuffix("\r")
+
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+def parse_iter(source: str | t.Iterable[str], factory: t.Type[T]) -> t.Iterator[T]:
+    """Like parse, but reads lazily and yields each record as soon as it's complete."""
+    lines_iter = iter_lines(source)
+    while True:
+        try:
+            record = factory.from_lines(lines_iter)
+        except StopIteration:
+            return
+        yield record
+
+
+def parse_all(raw_data: str, factory: t.Type[T], cache: ParseCache | None = None) -> T:
+    cache = cache or parse_cache
+    if cache is not None:
+        return cache.fetch(raw_data, factory, "parse_all", lambda: _parse_all(raw_data, factory))
+    return _parse_all(raw_data, factory)
+
+
+def _parse_all(raw_data: str, factory: t.Type[T]) -> T:
+    lines_iter = iter(raw_data.splitlines())
+    return factory.from_lines(lines_iter)
+
+
+def load(filename: str | Path) -> str:
+    with open(filename) as fp:
+        raw = fp.read()
+    return raw
+
+
+def open_input(filename: str | Path) -> t.TextIO:
+    """Open an input to stream through parse_iter.
+
+    Same as open(), but going through here lets bench time the reading as the load phase.
+    """
+    return open(filename)
+
+
+@dataclass(frozen=True, slots=True)
+class Coordinate:
+    """An x, y position, or an offset between two of them.
+
+    Hot loops that only need to hash and compare positions can skip the object entirely and work
+    with `pack`ed ints instead, turning them back with `unpack` when they're done.
+    """
+
+    x: int
+    y: int
+
+    def __add__(self, other: Coordinate) -> Coordinate:
+        return Coordinate(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other: Coordinate) -> Coordinate:
+        return Coordinate(self.x - other.x, self.y - other.y)
+
+    def __mul__(self, other: int) -> Coordinate:
+        return Coordinate(self.x * other, self.y * other)
+
+    def __mod__(self, other: Coordinate) -> Coordinate:
+        return Coordinate(self.x % other.x, self.y % other.y)
+
+    def __lt__(self, other: Coordinate) -> bool:
+        return (self.x, self.y) < (other.x, other.y)
+
+    def pack(self, stride: int) -> int:
+        """A single int for this position, which round trips as long as 0 <= x < stride and y >= 0."""
+        return self.y * stride + self.x
+
+    @classmethod
+    def unpack(cls, packed: int, stride: int) -> t.Self:
+        y, x = divmod(packed, stride)
+        return cls(x, y)
+
+
+@dataclass
+class Grid:
+    """A rectangular grid of byte sized cells, stored flat in a single bytearray.
+
+    The cells are surrounded by a one cell thick border holding the `border` sentinel, so anything
+    walking off the edge lands on the sentinel instead of needing a bounds check, and never wraps
+    around onto the next row. Cells are addressed by flat index, see `index` and `coords`.
+    """
+
+    width: int
+    height: int
+    cells: bytearray
+    border: int = 0
+
+    @classmethod
+    def empty(cls, width: int, height: int, fill: str = ".", border: str | int = 0) -> t.Self:
+        return cls.from_rows([fill * width] * height, border=border)
+
+    @classmethod
+    def from_rows(cls, rows: t.Iterable[str], border: str | int = 0) -> t.Self:
+        rows = list(rows)
+        height = len(rows)
+        width = len(rows[0]) if rows else 0
+        border = ord(border) if isinstance(border, str) else border
+        stride = width + 2
+
+        cells = bytearray([border]) * (stride * (height + 2))
+        for y, row in enumerate(rows):
+            encoded = row.encode()
+            if len(encoded) != width:
+                raise ValueError(f"Row {y} is {len(encoded)} cells wide, expected {width}")
+            start = (y + 1) * stride + 1
+            cells[start : start + width] = encoded
+
+        return cls(width, height, cells, border)
+
+    @property
+    def stride(self) -> int:
+        return self.width + 2
+
+    @functools.cached_property
+    def cardinals(self) -> tuple[int, int, int, int]:
+        """Offsets to step N, E, S and W."""
+        return -self.stride, 1, self.stride, -1
+
+    @functools.cached_property
+    def neighbors(self) -> tuple[int, ...]:
+        """Offsets to all 8 surrounding cells."""
+        s = self.stride
+        return -s - 1, -s, -s + 1, -1, 1, s - 1, s, s + 1
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def coords(self, i: int) -> tuple[int, int]:
+        y, x = divmod(i, self.stride)
+        return x - 1, y - 1
+
+    def offset(self, dx: int, dy: int) -> int:
+        return dy * self.stride + dx
+
+    def __getitem__(self, i: int) -> int:
+        return self.cells[i]
+
+    def __setitem__(self, i: int, value: int):
+        self.cells[i] = value
+
+    def at(self, x: int, y: int) -> int:
+        return self.cells[self.index(x, y)]
+
+    def inside(self, i: int) -> bool:
+        x, y = self.coords(i)
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def row(self, y: int) -> bytes:
+        start = self.index(0, y)
+        return bytes(self.cells[start : start + self.width])
+
+    def column(self, x: int) -> bytes:
+        return bytes(self.cells[self.index(x, 0) :: self.stride][: self.height])
+
+    def indices(self) -> t.Iterator[int]:
+        """Every cell inside the border, row by row."""
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def find(self, value: str | int) -> t.Iterator[int]:
+        target = ord(value) if isinstance(value, str) else value
+        return (i for i in self.indices() if self.cells[i] == target)
+
+    def copy(self) -> t.Self:
+        return type(self)(self.width, self.height, self.cells.copy(), self.border)
+
+    def __str__(self) -> str:
+        return "\n".join(self.row(y).decode() for y in range(self.height))
+
+
+def factorize(val: int) -> list[int]:
+    """Expanded prime factors of val as a list. ie 8 => [2, 2, 2]"""
+    if val == 1:
+        return [val]
+
+    return list(numtheory.factorize(val))
+
+
+def lcm(factors: list[int]) -> int:
+    """Least Common Multiple of all numbers in factors list"""
+    return numtheory.lcm(factors)
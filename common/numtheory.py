@@ -0,0 +1,127 @@
+"""Number theory for the puzzles that turn out to be about cycles and primes."""
+
+import functools
+import math
+import random
+import typing as t
+
+# Miller-Rabin with these bases is exact for every n below this, past it the extra random bases make a
+# wrong answer vanishingly unlikely.
+_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+_DETERMINISTIC_LIMIT = 318_665_857_834_031_151_167_461
+_EXTRA_ROUNDS = 16
+
+
+def lcm(values: t.Iterable[int]) -> int:
+    """Least common multiple of every value, 1 if there aren't any."""
+    return math.lcm(*values)
+
+
+def is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    for p in _BASES:
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    bases: t.Iterable[int] = _BASES
+    if n >= _DETERMINISTIC_LIMIT:
+        bases = [*_BASES, *(random.randrange(2, n - 1) for _ in range(_EXTRA_ROUNDS))]
+
+    for a in bases:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _pollard_rho(n: int) -> int:
+    """Some non-trivial factor of the odd composite n, using Brent's cycle finding."""
+    while True:
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        g = r = q = 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+
+        if g == n:
+            # overshot, step back through the last batch one at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+
+        if g != n:
+            return g
+
+
+@functools.cache
+def factorize(n: int) -> tuple[int, ...]:
+    """Prime factors of n in ascending order, with repeats. ie 12 => (2, 2, 3), and 1 => ()"""
+    if n < 1:
+        raise ValueError(f"Can only factorize positive integers, not {n}")
+
+    factors: list[int] = []
+    for p in _BASES:
+        while n % p == 0:
+            factors.append(p)
+            n //= p
+
+    pending = [n] if n > 1 else []
+    while pending:
+        m = pending.pop()
+        if is_prime(m):
+            factors.append(m)
+        else:
+            d = _pollard_rho(m)
+            pending.extend([d, m // d])
+
+    return tuple(sorted(factors))
+
+
+def mod_inverse(a: int, m: int) -> int:
+    """x such that a * x == 1 (mod m). Raises ValueError when a and m aren't coprime."""
+    return pow(a, -1, m)
+
+
+def crt(congruences: t.Iterable[tuple[int, int]]) -> tuple[int, int] | None:
+    """Solve x == r (mod m) for every (r, m) pair at once, where the moduli don't need to be coprime.
+
+    Returns (x, lcm of the moduli) with 0 <= x < lcm, so every solution is x + k * lcm. Returns None
+    when the congruences contradict each other.
+    """
+    x, modulus = 0, 1
+    for r, m in congruences:
+        g = math.gcd(modulus, m)
+        if (r - x) % g:
+            return None
+        # find k with x + modulus * k == r (mod m), which only has to hold mod m / g
+        step = m // g
+        k = (r - x) // g * pow(modulus // g, -1, step) % step
+        x += modulus * k
+        modulus *= step
+        x %= modulus
+
+    return x, modulus
@@ -0,0 +1,128 @@
+import contextlib
+import importlib
+import io
+import json
+import math
+import time
+import traceback
+import typing as t
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+
+import answers
+import common
+
+TIMINGS_PATH = Path("data/timings.json")
+
+
+@dataclass
+class DayResult:
+    day: int
+    output: str
+    elapsed: float
+    ok: bool
+    # part time served from the answer cache rather than run, which elapsed doesn't include
+    cached: float = 0
+
+
+def find_days(year: int) -> list[int]:
+    """Every dayNN module that exists for year, in order."""
+    return sorted(int(p.stem.removeprefix("day")) for p in Path(f"aoc{year}").glob("day[0-9][0-9].py"))
+
+
+def run_day(kind: str, year: int, day: int, parse_cache: bool = False, force: bool = False) -> DayResult:
+    """Import and run one day with its output captured, so it can be printed later in order."""
+    if parse_cache:
+        common.parse_cache = common.ParseCache()
+
+    buffer = io.StringIO()
+    ok = True
+    cached = 0.0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(buffer):
+        try:
+            m = importlib.import_module(f"aoc{year}.day{day:02}")
+            print(f"Running AOC {year}, Day {day:02}")
+            if kind == "test":
+                m.test()
+            else:
+                cached = answers.run_solution(m, year, day, force=force)
+        except (Exception, SystemExit):
+            traceback.print_exc(file=buffer)
+            ok = False
+
+    return DayResult(day, buffer.getvalue(), time.perf_counter() - start, ok, cached)
+
+
+def run_isolated(kind: str, year: int, day: int, parse_cache: bool = False, force: bool = False) -> DayResult:
+    """run_day in a worker of its own, so that if it kills the process nothing else goes with it."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(run_day, kind, year, day, parse_cache, force).result()
+        except BrokenProcessPool as e:
+            return DayResult(day, f"Running AOC {year}, Day {day:02}\nWorker process died: {e}\n", 0, False)
+
+
+def load_timings(path: Path = TIMINGS_PATH) -> dict[str, dict[str, dict[str, float]]]:
+    """Previously recorded wall times, as {kind: {year: {day: seconds}}}."""
+    try:
+        with open(path) as fp:
+            return json.load(fp)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_timings(timings: t.Mapping, path: Path = TIMINGS_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as fp:
+        json.dump(timings, fp, indent=2, sort_keys=True)
+
+
+def schedule(days: t.Iterable[int], known: t.Mapping[str, float]) -> list[int]:
+    """Longest job first. Days without a recorded time go first since they could be anything."""
+    return sorted(days, key=lambda d: known.get(str(d), math.inf), reverse=True)
+
+
+def run_year(
+    kind: str,
+    year: int,
+    workers: int | None = None,
+    parse_cache: bool = False,
+    force: bool = False,
+) -> bool:
+    """Run every day of year on a process pool, printing each day's output in day order.
+
+    Returns True if every day ran without raising.
+    """
+    days = find_days(year)
+    if not days:
+        print(f"Unable to find any days for AOC {year}")
+        return False
+
+    timings = load_timings()
+    known = timings.setdefault(kind, {}).setdefault(str(year), {})
+
+    all_ok = True
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # the pool hands out work in submission order, so this is what makes it longest job first
+        futures = {day: pool.submit(run_day, kind, year, day, parse_cache, force) for day in schedule(days, known)}
+        for day in days:
+            try:
+                result = futures[day].result()
+            except BrokenProcessPool:
+                result = None
+            if result is None:
+                # a worker died outright, which takes every unfinished day down with it, so give each
+                # of those a pool of its own to find out which one it really was
+                result = run_isolated(kind, year, day, parse_cache, force)
+            print(result.output, end="")
+            # a failed run says nothing about how long the day really takes, and a cached one only
+            # does once the time the cached parts really took is added back
+            if result.ok:
+                known[str(day)] = result.elapsed + result.cached
+            all_ok = all_ok and result.ok
+
+    save_timings(timings)
+    return all_ok
@@ -0,0 +1,107 @@
+import contextlib
+import importlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import traceback
+import typing as t
+from pathlib import Path
+from types import ModuleType
+
+import common
+
+SOCKET_PATH = Path("data/aoc.sock")
+
+Handler = t.Callable[[ModuleType, dict[str, t.Any]], bool | None]
+
+
+class Solvers:
+    """Day modules imported so far, reloaded individually when their file changes on disk.
+
+    Changes to common are not picked up, restart the server for those.
+    """
+
+    def __init__(self):
+        self.modules: dict[str, tuple[ModuleType, int]] = {}
+
+    def get(self, year: int, day: int) -> ModuleType:
+        name = f"aoc{year}.day{day:02}"
+        if name not in self.modules:
+            m = importlib.import_module(name)
+        else:
+            m, mtime = self.modules[name]
+            if self.mtime(m) != mtime:
+                m = importlib.reload(m)
+
+        self.modules[name] = (m, self.mtime(m))
+        return m
+
+    @staticmethod
+    def mtime(m: ModuleType) -> int:
+        return os.stat(m.__file__).st_mtime_ns if m.__file__ else 0
+
+
+def serve(handle: Handler, path: Path = SOCKET_PATH):
+    """Answer requests on a unix socket until interrupted, keeping modules and parsed inputs warm.
+
+    Each request is a single line of JSON with at least kind, day and year, and is passed with the module
+    for that day to handle. The response is JSON with everything handle printed, and whether it succeeded,
+    meaning it didn't raise or return False.
+    Requests are handled one at a time, since the output is captured by swapping out stdout.
+    """
+    solvers = Solvers()
+    memory_cache = common.MemoryParseCache()
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            request = json.loads(self.rfile.readline())
+            buffer = io.StringIO()
+            ok = True
+            # bench wants to time real parsing, not cache hits
+            common.parse_cache = None if request["kind"] == "bench" else memory_cache
+            with contextlib.redirect_stdout(buffer):
+                try:
+                    m = solvers.get(request["year"], request["day"])
+                    print(f"Running AOC {request['year']}, Day {request['day']:02}")
+                    ok = handle(m, request) is not False
+                except ModuleNotFoundError:
+                    print(f"Unable to find AOC {request['year']}, Day {request['day']:02}")
+                    ok = False
+                except Exception:
+                    traceback.print_exc(file=buffer)
+                    ok = False
+            self.wfile.write(json.dumps({"output": buffer.getvalue(), "ok": ok}).encode())
+
+    with contextlib.suppress(FileNotFoundError):
+        path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with socketserver.UnixStreamServer(str(path), RequestHandler) as server:
+        print(f"Serving on {path}, ctrl-c to stop")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def request(payload: dict[str, t.Any], path: Path = SOCKET_PATH) -> bool:
+    """Send one request to a running server and print its output. Returns whether it succeeded."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            print(f"No server listening on {path}, start one with: python -m aoc serve", file=sys.stderr)
+            return False
+
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile("rb") as fp:
+            response = json.load(fp)
+
+    print(response["output"], end="")
+    return response["ok"]